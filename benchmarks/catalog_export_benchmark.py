@@ -0,0 +1,98 @@
+"""
+Compares loading and filtering the plugin catalog from the `*.archive.json`
+directory written by `save_plugins` against the columnar Arrow IPC and Parquet
+catalogs written by `nomad_plugins.catalog_export`.
+
+The filter selects plugins with at least 100 stars that provide a parser.
+
+Usage:
+    python benchmarks/catalog_export_benchmark.py --count 10000
+"""
+
+import glob
+import json
+import os
+import tempfile
+import time
+
+import click
+import pyarrow.compute as pc
+from records_benchmark import as_records, fake_crawl_results
+
+from nomad_plugins.catalog_export import CatalogWriter, read_catalog
+from nomad_plugins.plugin_crawler import save_plugins
+
+MIN_STARS = 100
+
+
+def filter_json(archive_path: str) -> int:
+    selected = []
+    for path in glob.glob(os.path.join(archive_path, '*.archive.json')):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)['data']
+        if data.get('stars', 0) >= MIN_STARS and any(
+            ep.get('type') == 'Parser' for ep in data.get('plugin_entry_points', [])
+        ):
+            selected.append(data['name'])
+    return len(selected)
+
+
+def filter_catalog(catalog_path: str) -> int:
+    plugins, _ = read_catalog(catalog_path)
+    entry_points = plugins.column('plugin_entry_points')
+    types = pc.struct_field(pc.list_flatten(entry_points), 'type')
+    parents = pc.list_parent_indices(entry_points)
+    has_parser = pc.unique(pc.filter(parents, pc.equal(types, 'Parser')))
+    rows = pc.is_in(
+        pc.indices_nonzero(pc.greater_equal(plugins.column('stars'), MIN_STARS)),
+        value_set=has_parser,
+    )
+    return pc.sum(rows).as_py() or 0
+
+
+def timed(function, *args) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+@click.command()
+@click.option('--count', default=10000, help='Number of plugins to generate.')
+def main(count):
+    plugins = {f'owner_{p.name}': p for p in as_records(fake_crawl_results(count))}
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = os.path.join(tmp, 'archives')
+        os.makedirs(archive_path)
+        save_plugins(plugins, archive_path)
+        catalogs = {}
+        for format in ('arrow', 'parquet'):
+            catalogs[format] = os.path.join(tmp, format)
+            with CatalogWriter(catalogs[format], format) as writer:
+                for key, plugin in plugins.items():
+                    writer.write(key, plugin)
+
+        click.echo(
+            f'{"source":<8} {"load + filter (s)":>18} {"matches":>8} {"bytes":>12}'
+        )
+        duration, matches = timed(filter_json, archive_path)
+        click.echo(
+            f'{"json":<8} {duration:>18.3f} {matches:>8} '
+            f'{directory_size(archive_path):>12}'
+        )
+        for format, path in catalogs.items():
+            duration, matches = timed(filter_catalog, path)
+            click.echo(
+                f'{format:<8} {duration:>18.3f} {matches:>8} {directory_size(path):>12}'
+            )
+
+
+if __name__ == '__main__':
+    main()
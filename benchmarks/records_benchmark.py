@@ -0,0 +1,195 @@
+"""
+Compares the memory footprint and serialization time of the plugin records in
+`nomad_plugins.records` against the nested dictionaries the crawler used before.
+
+Each variant runs in a fresh interpreter so that the peak RSS values are not
+polluted by the other variant. Requires a platform with the `resource` module.
+
+Usage:
+    python benchmarks/records_benchmark.py --count 10000
+"""
+
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+
+import click
+
+from nomad_plugins.records import (
+    PluginEntryPointRecord,
+    PluginRecord,
+    PluginReferenceRecord,
+    PyprojectAuthorRecord,
+    dumps_archive,
+)
+
+ENTRY_POINT_TYPES = ['Schema package', 'Parser', 'Normalizer', 'App', None]
+
+
+def fake_crawl_results(count: int) -> list[dict]:
+    """
+    Generates fake crawl results shaped like the values found in `pyproject.toml`
+    files and the GitHub API responses.
+    """
+
+    rng = random.Random(0)
+    results = []
+    for i in range(count):
+        name = f'nomad-plugin-{i}'
+        results.append(
+            dict(
+                repository=f'https://github.com/owner-{i % 500}/{name}',
+                stars=rng.randint(0, 200),
+                created='2024-05-01T12:00:00Z',
+                last_updated='2024-10-01T12:00:00Z',
+                owner=f'owner-{i % 500}',
+                name=name,
+                description=f'A NOMAD plugin number {i}.',
+                authors=[
+                    {'name': f'Author {i}-{a}', 'email': f'author{a}@example.com'}
+                    for a in range(rng.randint(1, 4))
+                ],
+                dependencies=[
+                    f'nomad-dependency-{rng.randint(0, 50)}'
+                    for _ in range(rng.randint(0, 3))
+                ],
+                entry_points=[
+                    (f'entry_point_{e}', rng.choice(ENTRY_POINT_TYPES))
+                    for e in range(rng.randint(1, 4))
+                ],
+            )
+        )
+    return results
+
+
+def as_dicts(results: list[dict]) -> list[dict]:
+    return [
+        dict(
+            m_def='nomad_plugins.schema_packages.plugin.Plugin',
+            repository=r['repository'],
+            stars=r['stars'],
+            created=r['created'],
+            last_updated=r['last_updated'],
+            owner=r['owner'],
+            name=r['name'],
+            description=r['description'],
+            authors=[dict(a) for a in r['authors']],
+            maintainers=[],
+            plugin_dependencies=[
+                dict(
+                    m_def='nomad_plugins.schema_packages.plugin.PluginReference',
+                    name=d,
+                    location=f'https://pypi.org/project/{d}/',
+                    toml_directory='',
+                )
+                for d in r['dependencies']
+            ],
+            on_central=False,
+            on_example_oasis=False,
+            on_pypi=True,
+            plugin_entry_points=[
+                dict(
+                    m_def='nomad_plugins.schema_packages.plugin.PluginEntryPoint',
+                    name=name,
+                    module=f'{r["name"]}:{name}',
+                    type=type,
+                )
+                for name, type in r['entry_points']
+            ],
+            toml_directory='',
+        )
+        for r in results
+    ]
+
+
+def as_records(results: list[dict]) -> list[PluginRecord]:
+    return [
+        PluginRecord(
+            repository=r['repository'],
+            stars=r['stars'],
+            created=r['created'],
+            last_updated=r['last_updated'],
+            owner=sys.intern(r['owner']),
+            name=r['name'],
+            description=r['description'],
+            authors=[PyprojectAuthorRecord.from_toml(a) for a in r['authors']],
+            maintainers=[],
+            plugin_dependencies=[
+                PluginReferenceRecord(
+                    name=sys.intern(d),
+                    location=sys.intern(f'https://pypi.org/project/{d}/'),
+                    toml_directory='',
+                )
+                for d in r['dependencies']
+            ],
+            on_central=False,
+            on_example_oasis=False,
+            on_pypi=True,
+            plugin_entry_points=[
+                PluginEntryPointRecord(
+                    name=name, module=f'{r["name"]}:{name}', type=type
+                )
+                for name, type in r['entry_points']
+            ],
+            toml_directory='',
+        )
+        for r in results
+    ]
+
+
+def run_variant(variant: str, count: int) -> dict:
+    results = fake_crawl_results(count)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if variant == 'dict':
+        plugins = as_dicts(results)
+    else:
+        plugins = as_records(results)
+    del results
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if variant == 'dict':
+        # Same output format as `dumps_archive`, so only the record model differs
+        size = sum(
+            len(json.dumps({'data': p}, separators=(',', ':'), ensure_ascii=False))
+            for p in plugins
+        )
+    else:
+        size = sum(len(dumps_archive(p)) for p in plugins)
+    duration = time.perf_counter() - start
+    return dict(
+        rss_kib=peak - baseline,
+        serialize_s=duration,
+        output_bytes=size,
+    )
+
+
+@click.command()
+@click.option('--count', default=10000, help='Number of plugins to generate.')
+@click.option('--variant', type=click.Choice(['dict', 'record']), hidden=True)
+def main(count, variant):
+    if variant:
+        click.echo(json.dumps(run_variant(variant, count)))
+        return
+    click.echo(
+        f'{"variant":<8} {"peak RSS (KiB)":>15} {"serialize (s)":>14} {"bytes":>12}'
+    )
+    for name in ('dict', 'record'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--count', str(count), '--variant', name],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        click.echo(
+            f'{name:<8} {result["rss_kib"]:>15} {result["serialize_s"]:>14.3f} '
+            f'{result["output_bytes"]:>12}'
+        )
+
+
+if __name__ == '__main__':
+    main()
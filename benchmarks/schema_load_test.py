@@ -0,0 +1,137 @@
+"""
+Load test of the `Plugin` schema package on a synthetic catalog.
+
+Generates plugins with `nomad_plugins.synthetic`, runs `Plugin.normalize` and
+`PluginReference.normalize` for every entry and reports the throughput and the
+latency percentiles of each stage. The Elasticsearch search done by
+`PluginReference.normalize` is replaced with an in-memory lab ID index, optionally
+with an artificial latency to emulate the round trip to the search cluster.
+
+Usage:
+    python benchmarks/schema_load_test.py --count 10000
+"""
+
+import statistics
+import time
+from collections import Counter
+
+import click
+from nomad.datamodel import EntryArchive
+
+from nomad_plugins.schema_packages import plugin as plugin_schema
+from nomad_plugins.synthetic import fan_in, generate_plugins, lab_ids
+
+UPLOAD_ID = 'synthetic_upload'
+
+
+class CountingLogger:
+    """
+    Stands in for the structlog logger and counts the messages per level.
+    """
+
+    def __init__(self) -> None:
+        self.counts = Counter()
+
+    def bind(self, **kwargs) -> 'CountingLogger':
+        return self
+
+    def __getattr__(self, level: str):
+        def log(*args, **kwargs) -> None:
+            self.counts[level] += 1
+
+        return log
+
+
+class LocalSearch:
+    """
+    In-memory stand-in for the search on `results.eln.lab_ids`.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.index = {}
+        self.queries = 0
+
+    def add(self, entry_id: str, ids: list[str]) -> None:
+        for lab_id in ids:
+            self.index.setdefault(lab_id, []).append(
+                {'entry_id': entry_id, 'upload_id': UPLOAD_ID}
+            )
+
+    def __call__(self, archive: EntryArchive, lab_id: str) -> tuple[int, list]:
+        self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+        hits = self.index.get(lab_id, [])
+        return len(hits), hits[:1]
+
+
+def percentiles(latencies: list[float]) -> str:
+    if len(latencies) < 2:  # noqa: PLR2004
+        return 'n/a'
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    p50, p90, p99 = (cuts[i - 1] * 1e3 for i in (50, 90, 99))
+    return (
+        f'p50 {p50:.3f} ms, p90 {p90:.3f} ms, p99 {p99:.3f} ms, '
+        f'max {max(latencies) * 1e3:.3f} ms'
+    )
+
+
+@click.command()
+@click.option('--count', default=10000, help='Number of plugins to generate.')
+@click.option('--seed', default=0, help='Seed of the synthetic catalog.')
+@click.option(
+    '--search-latency',
+    default=0.0,
+    help='Artificial latency of each search in milliseconds.',
+)
+def main(count, seed, search_latency):
+    start = time.perf_counter()
+    plugins = generate_plugins(count, seed=seed)
+    click.echo(
+        f'Generated {len(plugins)} plugins in {time.perf_counter() - start:.1f} s, '
+        f'largest fan-in: {max(fan_in(plugins).values(), default=0)}'
+    )
+
+    search = LocalSearch(search_latency * 1e-3)
+    for key, plugin in plugins.items():
+        search.add(key, lab_ids(plugin))
+    plugin_schema.search_lab_id = search
+
+    logger = CountingLogger()
+    parse_latencies = []
+    plugin_latencies = []
+    reference_latencies = []
+    resolved = 0
+    start = time.perf_counter()
+    for key, plugin in plugins.items():
+        t0 = time.perf_counter()
+        archive = EntryArchive.m_from_dict(
+            {'metadata': {'entry_id': key}, 'data': plugin.to_archive()}
+        )
+        parse_latencies.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        archive.data.normalize(archive, logger)
+        plugin_latencies.append(time.perf_counter() - t0)
+        for reference in archive.data.plugin_dependencies:
+            t0 = time.perf_counter()
+            reference.normalize(archive, logger)
+            reference_latencies.append(time.perf_counter() - t0)
+            resolved += reference.m_is_set(type(reference).plugin)
+    duration = time.perf_counter() - start
+
+    click.echo(
+        f'Normalized {len(plugins)} entries in {duration:.2f} s '
+        f'({len(plugins) / duration:.0f} entries/s)'
+    )
+    click.echo(f'Archive from dict:         {percentiles(parse_latencies)}')
+    click.echo(f'Plugin.normalize:          {percentiles(plugin_latencies)}')
+    click.echo(f'PluginReference.normalize: {percentiles(reference_latencies)}')
+    click.echo(
+        f'References: {len(reference_latencies)}, resolved: {resolved}, '
+        f'searches: {search.queries}, log messages: {dict(logger.counts)}'
+    )
+
+
+if __name__ == '__main__':
+    main()
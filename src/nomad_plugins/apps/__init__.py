@@ -62,6 +62,28 @@ plugin_app_entry_point = AppEntryPoint(
                 f'data.last_updated#{schema}': Column(
                     label='Last modified',
                 ),
+                f'data.activity#{schema}': Column(
+                    label='Activity',
+                ),
+                f'data.n_plugin_dependencies#{schema}': Column(
+                    label='Number of dependencies',
+                ),
+                f'data.n_plugin_entry_points#{schema}': Column(
+                    label='Number of entry points',
+                ),
+                f'data.plugin_entry_point_types#{schema}': Column(
+                    label='Entry point types',
+                ),
+                f'data.total_import_time#{schema}': Column(
+                    label='Import time',
+                    unit='s',
+                    format={'decimals': 2},
+                ),
+                f'data.max_import_rss_delta#{schema}': Column(
+                    label='Import memory',
+                    unit='MiB',
+                    format={'decimals': 1},
+                ),
             },
         ),
         menu=Menu(
@@ -96,6 +118,33 @@ plugin_app_entry_point = AppEntryPoint(
                     title='Last modification date',
                     show_input=False,
                 ),
+                MenuItemTerms(
+                    search_quantity=f'data.activity#{schema}',
+                    title='Activity',
+                    show_input=False,
+                    options=3,
+                ),
+                MenuItemTerms(
+                    search_quantity=f'data.plugin_entry_point_types#{schema}',
+                    title='Entry point type combination',
+                    show_input=False,
+                    options=8,
+                ),
+                MenuItemHistogram(
+                    x=f'data.n_plugin_dependencies#{schema}',
+                    title='Number of dependencies',
+                    show_input=False,
+                ),
+                MenuItemHistogram(
+                    x=f'data.n_plugin_entry_points#{schema}',
+                    title='Number of entry points',
+                    show_input=False,
+                ),
+                MenuItemHistogram(
+                    x=f'data.total_import_time#{schema}',
+                    title='Import time',
+                    show_input=False,
+                ),
                 MenuItemTerms(
                     search_quantity=f'data.on_central#{schema}',
                     title='On central NOMAD',
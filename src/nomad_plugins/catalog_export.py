@@ -0,0 +1,221 @@
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from nomad_plugins.plugin_crawler import iter_plugins
+from nomad_plugins.records import PluginRecord, Record, parse_timestamp
+
+FORMATS = ('arrow', 'parquet')
+PLUGINS_FILE = 'plugins'
+DEPENDENCIES_FILE = 'plugin_dependencies'
+
+AUTHOR_TYPE = pa.struct([('name', pa.string()), ('email', pa.string())])
+IMPORT_TIME_TYPE = pa.struct(
+    [
+        ('module', pa.string()),
+        ('self_time', pa.float64()),
+        ('cumulative_time', pa.float64()),
+    ]
+)
+ENTRY_POINT_TYPE = pa.struct(
+    [
+        ('name', pa.string()),
+        ('module', pa.string()),
+        ('type', pa.string()),
+        ('import_time', pa.float64()),
+        ('import_rss_delta', pa.int64()),
+        ('import_time_breakdown', pa.list_(IMPORT_TIME_TYPE)),
+    ]
+)
+REFERENCE_TYPE = pa.struct(
+    [('name', pa.string()), ('location', pa.string()), ('toml_directory', pa.string())]
+)
+TIMESTAMP_TYPE = pa.timestamp('s', tz='UTC')
+
+PLUGIN_SCHEMA = pa.schema(
+    [
+        ('key', pa.string()),
+        ('repository', pa.string()),
+        ('stars', pa.int64()),
+        ('created', TIMESTAMP_TYPE),
+        ('last_updated', TIMESTAMP_TYPE),
+        ('owner', pa.string()),
+        ('name', pa.string()),
+        ('description', pa.string()),
+        ('authors', pa.list_(AUTHOR_TYPE)),
+        ('maintainers', pa.list_(AUTHOR_TYPE)),
+        ('plugin_dependencies', pa.list_(REFERENCE_TYPE)),
+        ('on_central', pa.bool_()),
+        ('on_example_oasis', pa.bool_()),
+        ('on_pypi', pa.bool_()),
+        ('plugin_entry_points', pa.list_(ENTRY_POINT_TYPE)),
+        ('toml_directory', pa.string()),
+    ]
+)
+DEPENDENCY_SCHEMA = pa.schema(
+    [
+        ('plugin', pa.string()),
+        ('plugin_name', pa.string()),
+        ('dependency_name', pa.string()),
+        ('dependency_location', pa.string()),
+    ]
+)
+
+
+def to_row(record: Record) -> dict:
+    """
+    Converts a record into a row of nested Python objects for pyarrow.
+    Args:
+        record (Record): The record to convert.
+    Returns:
+        dict: The row with repeating subsections as lists of dictionaries.
+    """
+
+    row = {}
+    for field in record.__slots__:
+        if field in record.transient:
+            continue
+        value = getattr(record, field)
+        if field in record.subsections:
+            value = [to_row(v) for v in value or []]
+        row[field] = value
+    return row
+
+
+def catalog_path(directory: str, name: str, format: str) -> str:
+    return os.path.join(directory, f'{name}.{format}')
+
+
+class CatalogWriter:
+    """
+    Incrementally writes plugin records to a columnar catalog consisting of a plugin
+    table with nested lists for the authors, entry points and dependencies, and a
+    flat table with one row per plugin dependency edge.
+
+    Rows are buffered and written as one record batch every `batch_size` plugins,
+    so only a single batch is held in memory.
+    """
+
+    def __init__(
+        self, directory: str, format: str = 'arrow', batch_size: int = 1000
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f'Unknown catalog format: {format}')
+        os.makedirs(directory, exist_ok=True)
+        self.batch_size = batch_size
+        self._plugin_rows = []
+        self._dependency_rows = []
+        self._plugins = self._open(
+            catalog_path(directory, PLUGINS_FILE, format), PLUGIN_SCHEMA, format
+        )
+        self._dependencies = self._open(
+            catalog_path(directory, DEPENDENCIES_FILE, format),
+            DEPENDENCY_SCHEMA,
+            format,
+        )
+
+    @staticmethod
+    def _open(path: str, schema: pa.Schema, format: str):
+        if format == 'parquet':
+            return pq.ParquetWriter(path, schema)
+        return pa.ipc.new_file(path, schema)
+
+    def write(self, key: str, plugin: PluginRecord) -> None:
+        """
+        Adds a plugin to the catalog.
+        Args:
+            key (str): The unique key of the plugin, as used for the archive file name.
+            plugin (PluginRecord): The plugin record.
+        """
+
+        row = {'key': key, **to_row(plugin)}
+        row['created'] = parse_timestamp(row['created'])
+        row['last_updated'] = parse_timestamp(row['last_updated'])
+        self._plugin_rows.append(row)
+        for dependency in plugin.plugin_dependencies or []:
+            self._dependency_rows.append(
+                dict(
+                    plugin=key,
+                    plugin_name=plugin.name,
+                    dependency_name=dependency.name,
+                    dependency_location=dependency.location,
+                )
+            )
+        if len(self._plugin_rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._plugin_rows:
+            self._plugins.write_batch(
+                pa.RecordBatch.from_pylist(self._plugin_rows, schema=PLUGIN_SCHEMA)
+            )
+            self._plugin_rows = []
+        if self._dependency_rows:
+            self._dependencies.write_batch(
+                pa.RecordBatch.from_pylist(
+                    self._dependency_rows, schema=DEPENDENCY_SCHEMA
+                )
+            )
+            self._dependency_rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self._plugins.close()
+        self._dependencies.close()
+
+    def __enter__(self) -> 'CatalogWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_catalog(directory: str) -> tuple[pa.Table, pa.Table]:
+    """
+    Reads a catalog written by `CatalogWriter` using memory mapping.
+    Args:
+        directory (str): The directory of the catalog.
+    Returns:
+        tuple[pa.Table, pa.Table]: The plugin table and the dependency edge table.
+    """
+
+    for format in FORMATS:
+        plugins_path = catalog_path(directory, PLUGINS_FILE, format)
+        if os.path.exists(plugins_path):
+            break
+    else:
+        raise FileNotFoundError(f'No plugin catalog found in {directory}')
+    dependencies_path = catalog_path(directory, DEPENDENCIES_FILE, format)
+    if format == 'parquet':
+        return (
+            pq.read_table(plugins_path, memory_map=True),
+            pq.read_table(dependencies_path, memory_map=True),
+        )
+    return (
+        pa.ipc.open_file(pa.memory_map(plugins_path)).read_all(),
+        pa.ipc.open_file(pa.memory_map(dependencies_path)).read_all(),
+    )
+
+
+def export_archives(
+    archive_path: str, directory: str, format: str = 'arrow', batch_size: int = 1000
+) -> int:
+    """
+    Converts the `*.archive.json` files written by `save_plugins` into a catalog.
+    The files are read one at a time, so only one record batch is held in memory.
+    Args:
+        archive_path (str): The directory containing the archive files.
+        directory (str): The directory to write the catalog to.
+        format (str): The format of the catalog, either 'arrow' or 'parquet'.
+        batch_size (int): The number of plugins per record batch.
+    Returns:
+        int: The number of exported plugins.
+    """
+
+    count = 0
+    with CatalogWriter(directory, format, batch_size) as writer:
+        for key, plugin in iter_plugins(archive_path):
+            writer.write(key, plugin)
+            count += 1
+    return count
@@ -0,0 +1,235 @@
+import random
+import time
+from http import HTTPStatus
+from typing import Optional
+from urllib.parse import urlparse
+
+import click
+import requests
+
+
+class HostUnavailable(Exception):
+    """
+    Raised if a host could not be reached after all retries or if its circuit is
+    open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing host for a cool-down window.
+
+    The circuit opens after `failure_threshold` consecutive failed calls. Once the
+    cool-down has passed, a single trial call is let through; it closes the circuit
+    on success and opens it for another cool-down on failure.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 3, cool_down: float = 300, clock=time.monotonic
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.clock = clock
+        self.failures = 0
+        self.open_until = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_until is not None
+
+    def allow(self) -> bool:
+        """
+        Checks if a call may be made.
+        Returns:
+            bool: True if the circuit is closed or the cool-down has passed.
+        """
+
+        if self.open_until is None:
+            return True
+        if self.clock() >= self.open_until:
+            # Half-open, the next failure opens the circuit again immediately
+            self.open_until = None
+            self.failures = self.failure_threshold - 1
+            return True
+        return False
+
+    def remaining_cool_down(self) -> float:
+        """
+        Gets the time until a trial call is let through.
+        Returns:
+            float: The time in seconds, 0 if the circuit is closed.
+        """
+
+        if self.open_until is None:
+            return 0.0
+        return max(self.open_until - self.clock(), 0.0)
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.open_until = self.clock() + self.cool_down
+
+    def trip(self, cool_down: float) -> None:
+        """
+        Opens the circuit right away, e.g. because the host asked to wait.
+        Args:
+            cool_down (float): The time in seconds until a trial call is let
+                               through.
+        """
+
+        self.failures = self.failure_threshold
+        self.open_until = self.clock() + cool_down
+
+
+class HostPolicy:
+    """
+    The timeouts, retries and circuit breaker used for the requests to one host.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        connect_timeout: float = 5,
+        read_timeout: float = 30,
+        retries: int = 2,
+        backoff: float = 1,
+        failure_threshold: int = 3,
+        cool_down: float = 300,
+        max_rate_limit_wait: float = 60,
+    ) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        # Longer rate limit waits open the circuit instead of blocking the caller
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.breaker = CircuitBreaker(failure_threshold, cool_down)
+
+
+HOST_POLICIES = {
+    'api.github.com': HostPolicy(read_timeout=30),
+    'pypi.org': HostPolicy(read_timeout=10),
+    'gitlab.mpcdf.mpg.de': HostPolicy(read_timeout=10),
+}
+RETRY_STATUS_CODES = {
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+
+RATE_LIMIT_STATUS_CODES = {HTTPStatus.FORBIDDEN, HTTPStatus.TOO_MANY_REQUESTS}
+
+
+def rate_limit_wait(response: requests.Response) -> Optional[float]:
+    """
+    Gets the time to wait before the next request if a response says that the rate
+    limit is exceeded. GitHub answers with 403 or 429 and either a `Retry-After`
+    header or `X-RateLimit-Remaining: 0` together with the reset time as a Unix
+    timestamp in `X-RateLimit-Reset`.
+    Args:
+        response (requests.Response): The response to check.
+    Returns:
+        Optional[float]: The time in seconds, None if the response is not about the
+                         rate limit.
+    """
+
+    if response.status_code not in RATE_LIMIT_STATUS_CODES:
+        return None
+    headers = response.headers
+    try:
+        if 'Retry-After' in headers:
+            return max(float(headers['Retry-After']), 0.0)
+        if headers.get('X-RateLimit-Remaining') == '0':
+            return max(float(headers['X-RateLimit-Reset']) - time.time(), 0.0)
+    except (KeyError, ValueError):
+        return None
+    return None
+
+
+def policy_for(host: str) -> HostPolicy:
+    """
+    Gets the policy of a host, creating a default one for unknown hosts.
+    Args:
+        host (str): The host name.
+    Returns:
+        HostPolicy: The policy of the host.
+    """
+
+    if host not in HOST_POLICIES:
+        HOST_POLICIES[host] = HostPolicy()
+    return HOST_POLICIES[host]
+
+
+def wait_for_recovery() -> float:
+    """
+    Sleeps until the cool-down of every open circuit has passed, so a final pass
+    over the failed requests gets another chance at every host.
+    Returns:
+        float: The time in seconds that was waited.
+    """
+
+    remaining = max(
+        (p.breaker.remaining_cool_down() for p in HOST_POLICIES.values()), default=0.0
+    )
+    if remaining:
+        click.echo(f'Waiting {remaining:.0f} s for unavailable hosts to recover')
+        time.sleep(remaining)
+    return remaining
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    Sends a GET request using the timeouts, retries and circuit breaker of the host.
+    Connection errors, timeouts and responses with a status code in
+    `RETRY_STATUS_CODES` are retried with exponential backoff and full jitter.
+    If the rate limit is exceeded, the request is retried after the time the host
+    asks for, or the circuit is opened for that time if it is longer than
+    `max_rate_limit_wait` of the host policy.
+    Args:
+        url (str): The URL to request.
+        **kwargs: Further arguments passed to `requests.get`.
+    Returns:
+        requests.Response: The response.
+    Raises:
+        HostUnavailable: If the circuit of the host is open or all attempts failed.
+    """
+
+    host = urlparse(url).hostname
+    policy = policy_for(host)
+    if not policy.breaker.allow():
+        raise HostUnavailable(f'{host} is unavailable, skipping {url}')
+    kwargs.setdefault('timeout', policy.timeout)
+    error = None
+    for attempt in range(policy.retries + 1):
+        if attempt:
+            time.sleep(random.uniform(0, policy.backoff * 2 ** (attempt - 1)))
+        try:
+            response = requests.get(url, **kwargs)
+        except requests.RequestException as e:
+            error = str(e)
+            continue
+        error = f'{response.status_code}, {response.text[:200]}'
+        wait = rate_limit_wait(response)
+        if wait is not None:
+            if wait > policy.max_rate_limit_wait or attempt == policy.retries:
+                policy.breaker.trip(wait)
+                click.echo(f'Rate limit of {host} exceeded, waiting {wait:.0f} s')
+                raise HostUnavailable(f'Failed to get {url}: {error}')
+            time.sleep(wait)
+            continue
+        if response.status_code not in RETRY_STATUS_CODES:
+            policy.breaker.record_success()
+            return response
+    policy.breaker.record_failure()
+    if policy.breaker.is_open:
+        click.echo(
+            f'Stopping requests to {host} for {policy.breaker.cool_down:g} s after '
+            'repeated failures'
+        )
+    raise HostUnavailable(f'Failed to get {url}: {error}')
@@ -0,0 +1,340 @@
+import heapq
+import itertools
+import statistics
+import time
+from collections import deque
+from collections.abc import Callable
+from http import HTTPStatus
+
+import click
+
+from nomad_plugins import plugin_crawler
+from nomad_plugins.circuit_breaker import HostUnavailable
+from nomad_plugins.records import (
+    ACTIVITY_BUCKETS,
+    PluginRecord,
+    activity_of,
+    parse_timestamp,
+)
+
+DAY = 24 * 3600
+
+
+class SystemClock:
+    """
+    The wall clock used by the scheduler. Tests replace it with a simulated clock
+    that provides the same two methods.
+    """
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class RepoState:
+    """
+    The scheduling state of a single plugin repository.
+    """
+
+    __slots__ = (
+        'name',
+        'item',
+        'etag',
+        'pushes',
+        'next_check',
+        'failures',
+        'activity',
+    )
+
+    def __init__(self, name: str, item: dict, history: int) -> None:
+        self.name = name
+        self.item = item
+        self.etag = None
+        self.pushes = deque(maxlen=history)
+        self.next_check = 0.0
+        self.failures = 0
+        self.activity = None
+
+    def change_rate(self, now: float) -> float:
+        """
+        Estimates the number of pushes per second from the distinct `pushed_at`
+        values observed so far. The window extends to `now`, so the estimated rate
+        decays for repositories that have gone quiet.
+        Args:
+            now (float): The current time in seconds since the epoch.
+        Returns:
+            float: The estimated change rate, 0 if no push has been observed.
+        """
+
+        if not self.pushes:
+            return 0.0
+        return len(self.pushes) / max(now - self.pushes[0], 1.0)
+
+    def current_activity(self, now: float) -> str:
+        """
+        Gets the activity bucket of the repository as `Plugin.normalize` would
+        compute it now.
+        Args:
+            now (float): The current time in seconds since the epoch.
+        Returns:
+            str: The label of the bucket, or None if no push has been observed.
+        """
+
+        if not self.pushes:
+            return None
+        return activity_of(int((now - self.pushes[-1]) // DAY))
+
+    def next_activity_change(self, now: float) -> float:
+        """
+        Gets the time at which the repository moves to the next activity bucket
+        if it is not pushed to again.
+        Args:
+            now (float): The current time in seconds since the epoch.
+        Returns:
+            float: The time in seconds since the epoch, or None if the repository
+                   is already in the last bucket.
+        """
+
+        if not self.pushes:
+            return None
+        for limit, _ in ACTIVITY_BUCKETS:
+            change = self.pushes[-1] + (limit + 1) * DAY
+            if change > now:
+                return change
+        return None
+
+
+class CrawlScheduler:
+    """
+    Continuously keeps the plugin catalog fresh.
+
+    Known repositories are kept in a priority queue keyed on the time of their next
+    check. Each check is a conditional request for the repository details, and only
+    repositories with a new `pushed_at` are crawled again. The interval between
+    checks is half the expected time between pushes, clamped to
+    [`min_interval`, `max_interval`], but a repository is also checked when it
+    is due to move to another activity bucket. A periodic discovery sweep over the
+    code search adds new plugins, and changed plugins are handed to `emit` in
+    batches. `emit` returns whether the batch was published.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        headers: dict,
+        emit: Callable[[dict[str, PluginRecord]], bool],
+        *,
+        clock=None,
+        min_interval: float = 600,
+        max_interval: float = 7 * 24 * 3600,
+        discovery_interval: float = 6 * 3600,
+        emit_interval: float = 900,
+        report_interval: float = 3600,
+        history: int = 8,
+    ) -> None:
+        self.headers = headers
+        self.emit = emit
+        self.clock = clock or SystemClock()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.history = history
+        self.repos: dict[str, RepoState] = {}
+        self.pending: dict[str, PluginRecord] = {}
+        self.pending_pushes: dict[str, float] = {}
+        self.latencies: list[float] = []
+        self.requests = dict(
+            search_pages=0,
+            repo_checks=0,
+            not_modified=0,
+            crawls=0,
+        )
+        self._queue: list[tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        now = self.clock.time()
+        self._tasks = [
+            [now, discovery_interval, self.discover],
+            [now + emit_interval, emit_interval, self.flush],
+            [now + report_interval, report_interval, self.report],
+        ]
+
+    def interval(self, repo: RepoState) -> float:
+        """
+        Computes the time until the next check of a repository.
+        Args:
+            repo (RepoState): The repository.
+        Returns:
+            float: The interval in seconds.
+        """
+
+        rate = repo.change_rate(self.clock.time())
+        if rate <= 0:
+            return self.max_interval
+        return min(max(0.5 / rate, self.min_interval), self.max_interval)
+
+    def schedule(self, repo: RepoState, due: float) -> None:
+        repo.next_check = due
+        heapq.heappush(self._queue, (due, next(self._counter), repo.name))
+
+    def discover(self) -> None:
+        """
+        Sweeps the code search results and schedules all new repositories for an
+        immediate check.
+        """
+
+        now = self.clock.time()
+        try:
+            for page in plugin_crawler.iter_search_pages(self.headers):
+                self.requests['search_pages'] += 1
+                for item in page['items']:
+                    name = item['repository']['full_name'].replace('/', '_')
+                    if name in self.repos:
+                        self.repos[name].item = item
+                        continue
+                    repo = RepoState(name, item, self.history)
+                    self.repos[name] = repo
+                    self.schedule(repo, now)
+        except plugin_crawler.IncompleteSearch as e:
+            # The repositories found so far are kept, the rest follows next sweep
+            click.echo(f'Discovery stopped early: {e}')
+
+    def check(self, repo: RepoState) -> None:
+        """
+        Checks a repository for a new push and crawls it again if it changed or
+        moved to another activity bucket since it was last emitted.
+        Args:
+            repo (RepoState): The repository to check.
+        """
+
+        full_name = repo.item['repository']['full_name']
+        status, details, etag = plugin_crawler.fetch_repo_details_conditional(
+            full_name, self.headers, repo.etag
+        )
+        self.requests['repo_checks'] += 1
+        if status is None:
+            # GitHub could not be reached, try again as early as allowed
+            self.schedule(repo, self.clock.time() + self.min_interval)
+            return
+        now = self.clock.time()
+        pushed_at = None
+        if details is None:
+            if status == HTTPStatus.NOT_MODIFIED:
+                self.requests['not_modified'] += 1
+        elif details.get('pushed_at'):
+            pushed_at = parse_timestamp(details['pushed_at']).timestamp()
+            if repo.pushes and pushed_at <= repo.pushes[-1]:
+                pushed_at = None
+        # Dormant repositories are crawled again when they move to another activity
+        # bucket, as the index only learns about it when the entry is reprocessed
+        if pushed_at is not None or (
+            repo.activity is not None and repo.current_activity(now) != repo.activity
+        ):
+            self.requests['crawls'] += 1
+            try:
+                plugin = plugin_crawler.get_plugin(
+                    repo.item, self.headers, repo_details=details
+                )
+            except HostUnavailable as e:
+                click.echo(f'Failed to crawl {repo.name}: {e}')
+                plugin = None
+            if plugin is None:
+                # Keep the old ETag and pushes, so the next check sees the push
+                # again instead of a 304, and back off in case it never succeeds
+                repo.failures += 1
+                retry = self.min_interval * 2 ** (repo.failures - 1)
+                self.schedule(repo, now + min(retry, self.max_interval))
+                return
+            repo.failures = 0
+            if pushed_at is not None:
+                # The first observation is the initial crawl, not a fresh push
+                # The latency is measured from the oldest push not yet emitted
+                if repo.pushes:
+                    self.pending_pushes.setdefault(repo.name, pushed_at)
+                repo.pushes.append(pushed_at)
+            repo.activity = repo.current_activity(now)
+            self.pending[repo.name] = plugin
+        repo.etag = etag
+        due = now + self.interval(repo)
+        change = repo.next_activity_change(now)
+        if change is not None:
+            due = min(due, change)
+        self.schedule(repo, due)
+
+    def flush(self) -> None:
+        """
+        Emits the plugins that changed since the last flush. Fields that were left
+        unknown because a host was down are checked once more before. If `emit`
+        fails, the plugins stay pending and are emitted with the next flush.
+        """
+
+        if not self.pending:
+            return
+        plugin_crawler.fill_unknown(self.pending, self.headers)
+        if not self.emit(self.pending):
+            # Keep the batch, so the next flush includes it together with the
+            # plugins that changed in the meantime
+            click.echo(f'Failed to emit {len(self.pending)} plugins, retrying later')
+            return
+        now = self.clock.time()
+        self.latencies.extend(now - pushed for pushed in self.pending_pushes.values())
+        self.pending = {}
+        self.pending_pushes = {}
+
+    def stats(self) -> dict:
+        """
+        Summarizes the freshness latency, i.e. the time from a push until the
+        changed plugin was emitted, and the number of requests spent.
+        Returns:
+            dict: The statistics.
+        """
+
+        stats = dict(repositories=len(self.repos), updates=len(self.latencies))
+        stats.update(self.requests)
+        if self.latencies:
+            stats['median_latency_s'] = statistics.median(self.latencies)
+            stats['max_latency_s'] = max(self.latencies)
+        return stats
+
+    def report(self) -> None:
+        click.echo(', '.join(f'{k}: {v:g}' for k, v in self.stats().items()))
+
+    def step(self, until: float = None) -> None:
+        """
+        Runs the periodic task or repository check that is due first, sleeping until
+        it is due if necessary.
+        Args:
+            until (float): If the next action is due after this time, only sleep
+                           until then.
+        """
+
+        task = min(self._tasks, key=lambda t: t[0])
+        due = task[0]
+        if self._queue and self._queue[0][0] < due:
+            due, _, name = self._queue[0]
+            task = None
+        if until is not None and due >= until:
+            self.clock.sleep(max(until - self.clock.time(), 0))
+            return
+        wait = due - self.clock.time()
+        if wait > 0:
+            self.clock.sleep(wait)
+        if task is not None:
+            task[0] = self.clock.time() + task[1]
+            task[2]()
+            return
+        heapq.heappop(self._queue)
+        repo = self.repos[name]
+        if repo.next_check == due:
+            self.check(repo)
+
+    def run(self, until: float = None) -> None:
+        """
+        Runs the scheduler.
+        Args:
+            until (float): The time in seconds since the epoch at which to stop.
+                           Runs forever if not given.
+        """
+
+        while until is None or self.clock.time() < until:
+            self.step(until)
+        self.flush()
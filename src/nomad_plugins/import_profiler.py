@@ -0,0 +1,258 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import click
+
+from nomad_plugins.records import ImportTimeRecord, PluginRecord
+
+PROBE_MARKER = 'nomad-plugins import profile start'
+
+# Runs in a fresh interpreter of the isolated environment. Everything imported before
+# the marker is part of the baseline and left out of the breakdown.
+PROBE = f"""
+import json
+import os
+import sys
+import time
+
+
+def rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+module_name, _, attributes = sys.argv[1].partition(':')
+# NOMAD itself is loaded by every deployment anyway, so it is part of the baseline
+for baseline_module in ('nomad.config', 'nomad.metainfo', 'nomad.datamodel'):
+    try:
+        __import__(baseline_module)
+    except ImportError:
+        pass
+before = rss()
+print({PROBE_MARKER!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+# `-X importtime` does not report modules imported with `importlib.import_module`
+__import__(module_name)
+entry_point = sys.modules[module_name]
+for attribute in filter(None, attributes.split('.')):
+    entry_point = getattr(entry_point, attribute)
+if hasattr(entry_point, 'load'):
+    entry_point.load()
+import_time = time.perf_counter() - start
+print(json.dumps(dict(import_time=import_time, import_rss_delta=rss() - before)))
+"""
+
+# The fields of an entry point record set by the profiling
+METRIC_FIELDS = ('import_time', 'import_rss_delta', 'import_time_breakdown')
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(.+)$')
+
+
+def parse_importtime(stderr: str, top: int = 10) -> list[ImportTimeRecord]:
+    """
+    Parses the output of `python -X importtime` written after the probe marker.
+    Args:
+        stderr (str): The standard error of the profiled interpreter.
+        top (int): The number of modules to keep.
+    Returns:
+        list[ImportTimeRecord]: The modules with the highest self import time, with
+            the times in seconds.
+    """
+
+    _, _, stderr = stderr.partition(PROBE_MARKER)
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            modules.append(
+                ImportTimeRecord(
+                    module=match.group(3).strip(),
+                    self_time=int(match.group(1)) * 1e-6,
+                    cumulative_time=int(match.group(2)) * 1e-6,
+                )
+            )
+    modules.sort(key=lambda m: m.self_time, reverse=True)
+    return modules[:top]
+
+
+def profile_entry_point(
+    python: str, entry_point: str, timeout: float = 300, top: int = 10, cwd=None
+) -> dict:
+    """
+    Imports and loads an entry point in a fresh interpreter.
+    Args:
+        python (str): The path of the Python interpreter to use.
+        entry_point (str): The entry point, e.g. 'my_plugin.parsers:my_parser'.
+        timeout (float): The time in seconds after which the profiling is aborted.
+        top (int): The number of modules to keep in the import time breakdown.
+        cwd (str): The working directory of the interpreter.
+    Returns:
+        dict: The `import_time`, `import_rss_delta` and `import_time_breakdown` of
+              the entry point, or None if it could not be loaded.
+    """
+
+    try:
+        result = subprocess.run(
+            [python, '-X', 'importtime', '-c', PROBE, entry_point],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=cwd,
+            check=False,
+        )
+    except subprocess.TimeoutExpired:
+        click.echo(f'Loading {entry_point} timed out after {timeout} s')
+        return None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1:] or ['unknown error']
+        click.echo(f'Failed to load {entry_point}: {error[0]}')
+        return None
+    metrics = json.loads(result.stdout.strip().splitlines()[-1])
+    metrics['import_time_breakdown'] = parse_importtime(result.stderr, top)
+    return metrics
+
+
+def create_environment(name: str, wheelhouse: str, env_dir: str) -> str:
+    """
+    Creates a virtual environment and installs a plugin into it from a local
+    wheelhouse without accessing any package index.
+    Args:
+        name (str): The distribution name of the plugin.
+        wheelhouse (str): The directory containing the wheels of the plugin and all
+                          its dependencies.
+        env_dir (str): The directory to create the environment in.
+    Returns:
+        str: The path to the Python interpreter of the environment, or None if the
+             plugin could not be installed.
+    """
+
+    bin_dir = 'Scripts' if os.name == 'nt' else 'bin'
+    python = os.path.join(env_dir, bin_dir, 'python')
+    commands = [
+        [sys.executable, '-m', 'venv', env_dir],
+        [
+            python,
+            '-m',
+            'pip',
+            'install',
+            '--quiet',
+            '--no-index',
+            '--find-links',
+            wheelhouse,
+            name,
+        ],
+    ]
+    for command in commands:
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            click.echo(f'Failed to install {name}: {result.stderr.strip()}')
+            return None
+    return python
+
+
+def profile_plugin(  # noqa: PLR0913, PLR0917
+    key: str,
+    name: str,
+    entry_points: list[tuple[str, str]],
+    wheelhouse: str,
+    work_dir: str,
+    timeout: float,
+    top: int,
+) -> tuple[str, dict]:
+    """
+    Installs a plugin into a new environment and profiles all its entry points.
+    Args:
+        key (str): The key of the plugin.
+        name (str): The distribution name of the plugin.
+        entry_points (list[tuple[str, str]]): The names and values of the entry
+                                              points.
+        wheelhouse (str): The directory containing the wheels.
+        work_dir (str): The directory to create the environment in. It is removed
+                        afterwards.
+        timeout (float): The time in seconds after which loading an entry point is
+                         aborted.
+        top (int): The number of modules to keep in the import time breakdowns.
+    Returns:
+        tuple[str, dict]: The key of the plugin and a dictionary of the metrics of
+                          each successfully profiled entry point.
+    """
+
+    env_dir = os.path.join(work_dir, key)
+    try:
+        python = create_environment(name, wheelhouse, env_dir)
+        if python is None:
+            return key, {}
+        metrics = {}
+        for entry_point_name, entry_point in entry_points:
+            result = profile_entry_point(python, entry_point, timeout, top, work_dir)
+            if result is not None:
+                metrics[entry_point_name] = result
+        return key, metrics
+    finally:
+        shutil.rmtree(env_dir, ignore_errors=True)
+
+
+def profile_plugins(  # noqa: PLR0913
+    plugins: dict[str, PluginRecord],
+    wheelhouse: str,
+    work_dir: str,
+    *,
+    workers: int = None,
+    timeout: float = 300,
+    top: int = 10,
+) -> int:
+    """
+    Profiles the entry points of plugins in parallel and stores the metrics on their
+    entry point records. The metrics of entry points that could not be profiled are
+    reset to None.
+    Args:
+        plugins (dict[str, PluginRecord]): The plugins by key.
+        wheelhouse (str): The directory containing the wheels of the plugins and all
+                          their dependencies.
+        work_dir (str): The directory to create the environments in.
+        workers (int): The number of processes to use. Defaults to the CPU count.
+        timeout (float): The time in seconds after which loading an entry point is
+                         aborted.
+        top (int): The number of modules to keep in the import time breakdowns.
+    Returns:
+        int: The number of profiled entry points.
+    """
+
+    wheelhouse = os.path.abspath(wheelhouse)
+    profiled = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                profile_plugin,
+                key,
+                plugin.name,
+                [(ep.name, ep.module) for ep in plugin.plugin_entry_points or []],
+                wheelhouse,
+                work_dir,
+                timeout,
+                top,
+            )
+            for key, plugin in plugins.items()
+            if plugin.name and plugin.plugin_entry_points
+        ]
+        with click.progressbar(length=len(futures), label='Profiling plugins') as bar:
+            for future in as_completed(futures):
+                key, metrics = future.result()
+                for entry_point in plugins[key].plugin_entry_points:
+                    # Entry points that failed lose the metrics of earlier runs
+                    result = metrics.get(entry_point.name, {})
+                    for field in METRIC_FIELDS:
+                        setattr(entry_point, field, result.get(field))
+                profiled += len(metrics)
+                bar.update(1)
+    return profiled
@@ -1,29 +1,59 @@
 import base64
+import glob
+import itertools
 import json
 import os
 import re
 import shutil
+import tempfile
+import time
+from collections.abc import Callable, Iterator
 from enum import Enum
 
 import click
 import requests
 import toml
 
+from nomad_plugins import circuit_breaker
+from nomad_plugins.circuit_breaker import HostUnavailable
+from nomad_plugins.records import (
+    ENTRY_POINT_TYPES,
+    PluginEntryPointRecord,
+    PluginRecord,
+    PluginReferenceRecord,
+    PyprojectAuthorRecord,
+    dumps_archive,
+    intern_optional,
+)
+
+# The base URLs of the external services, overridable to crawl a stub API in tests
+GITHUB_API = os.environ.get('NOMAD_PLUGINS_GITHUB_API', 'https://api.github.com')
+PYPI_API = os.environ.get('NOMAD_PLUGINS_PYPI_API', 'https://pypi.org/pypi')
+NOMAD_DISTRO_URL = os.environ.get(
+    'NOMAD_PLUGINS_DISTRO_URL',
+    'https://gitlab.mpcdf.mpg.de/nomad-lab/nomad-distro/-/raw',
+)
+
 
 class OasisURLs(Enum):
-    CENTRAL = (
-        'https://gitlab.mpcdf.mpg.de/nomad-lab/nomad-distro/-/raw/'
-        'main/pyproject.toml'
-    )
-    EXAMPLE = (
-        'https://gitlab.mpcdf.mpg.de/nomad-lab/nomad-distro/-/raw/'
-        'test-oasis/pyproject.toml'
-    )
+    CENTRAL = f'{NOMAD_DISTRO_URL}/main/pyproject.toml'
+    EXAMPLE = f'{NOMAD_DISTRO_URL}/test-oasis/pyproject.toml'
 
 
 # GitHub Code Search API URL
-GITHUB_CODE_API = 'https://api.github.com/search/code'
-GITHUB_REPO_API = 'https://api.github.com/repos'
+GITHUB_CODE_API = f'{GITHUB_API}/search/code'
+GITHUB_REPO_API = f'{GITHUB_API}/repos'
+
+
+class IncompleteSearch(Exception):
+    """
+    Raised if the code search results could not be fetched completely.
+    """
+
+
+# Time in seconds for which the plugin lists of the oasis distributions are cached
+OASIS_CACHE_TTL = 3600
+_oasis_plugins: dict = {}
 
 
 def fetch_file_created(repo_name: str, file_path: str, headers: dict) -> str:
@@ -38,6 +68,8 @@ def fetch_file_created(repo_name: str, file_path: str, headers: dict) -> str:
     Returns:
         str: The creation date of the file in ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ),
              or None if the commits could not be fetched.
+    Raises:
+        HostUnavailable: If the GitHub API cannot be reached.
     """
 
     commits_url = f'{GITHUB_REPO_API}/{repo_name}/commits?path={file_path}'
@@ -50,7 +82,7 @@ def fetch_file_created(repo_name: str, file_path: str, headers: dict) -> str:
             'per_page': 30,
             'page': commits_page,
         }
-        commits_response = requests.get(
+        commits_response = circuit_breaker.get(
             commits_url, headers=headers, params=commits_params
         )
         if commits_response.ok:
@@ -84,10 +116,12 @@ def fetch_repo_details(repo_full_name: str, headers: dict) -> dict:
               successful.
               Returns None if the request fails, and prints an error message with the
               status code and response text.
+    Raises:
+        HostUnavailable: If the GitHub API cannot be reached.
     """
 
     repo_url = f'{GITHUB_REPO_API}/{repo_full_name}'
-    response = requests.get(repo_url, headers=headers)
+    response = circuit_breaker.get(repo_url, headers=headers)
     if response.ok:
         return response.json()
     else:
@@ -98,6 +132,43 @@ def fetch_repo_details(repo_full_name: str, headers: dict) -> dict:
         return None
 
 
+def fetch_repo_details_conditional(
+    repo_full_name: str, headers: dict, etag: str = None
+) -> tuple[int, dict, str]:
+    """
+    Fetches the details of a GitHub repository using a conditional request.
+    GitHub answers with `304 Not Modified` if the ETag still matches, which does not
+    count against the rate limit.
+    Args:
+        repo_full_name (str): The full name of the repository (e.g., 'owner/repo').
+        headers (dict): The headers to include in the request, typically containing
+                        the authorization token.
+        etag (str): The ETag of the previously fetched details, if any.
+    Returns:
+        tuple[int, dict, str]: The status code of the response (None if GitHub could
+              not be reached), the repository details (None unless the status is
+              200) and the ETag to use for the next request.
+    """
+
+    repo_url = f'{GITHUB_REPO_API}/{repo_full_name}'
+    if etag:
+        headers = {**headers, 'If-None-Match': etag}
+    try:
+        response = circuit_breaker.get(repo_url, headers=headers)
+    except HostUnavailable as e:
+        click.echo(f'Failed to fetch repository details for {repo_full_name}: {e}')
+        return None, None, etag
+    if response.status_code == requests.codes.not_modified:
+        return response.status_code, None, etag
+    if response.ok:
+        return response.status_code, response.json(), response.headers.get('ETag')
+    click.echo(
+        f'Failed to fetch repository details for {repo_full_name}: '
+        f'{response.status_code}, {response.text}'
+    )
+    return response.status_code, None, etag
+
+
 def get_toml_project(url: str, subdirectory: str, headers: dict) -> dict:
     """
     Fetches and parses the `pyproject.toml` file from a given GitHub repository.
@@ -110,11 +181,13 @@ def get_toml_project(url: str, subdirectory: str, headers: dict) -> dict:
     Returns:
         dict: A dictionary containing the 'project' section of the `pyproject.toml` file
               if successful, otherwise an empty dictionary.
+    Raises:
+        HostUnavailable: If the GitHub API cannot be reached.
     """
 
     repo_api_url = url.replace('https://github.com', GITHUB_REPO_API)
     request_url = f'{repo_api_url}/contents/{subdirectory}pyproject.toml'
-    response = requests.get(request_url, headers=headers)
+    response = circuit_breaker.get(request_url, headers=headers)
     if response.ok:
         content = response.json().get('content')
         if content:
@@ -123,9 +196,6 @@ def get_toml_project(url: str, subdirectory: str, headers: dict) -> dict:
                 return toml.loads(toml_content).get('project', {})
             except toml.TomlDecodeError as e:
                 click.echo(f'Failed to parse pyproject.toml from {request_url}: {e}')
-    elif response.status_code == requests.codes.forbidden:
-        msg = 'Too many requests to GitHub API. Please try again later.'
-        click.echo(msg)
     else:
         msg = (
             f'Failed to get pyproject.toml from {request_url}: '
@@ -135,33 +205,126 @@ def get_toml_project(url: str, subdirectory: str, headers: dict) -> dict:
     return {}
 
 
-def on_gitlab_oasis(plugin_name: str, oasis_toml: OasisURLs) -> bool:
+def get_oasis_plugins(oasis_toml: OasisURLs) -> frozenset:
     """
-    Checks if a given plugin name is listed in the plugin dependencies of a
-    pyproject.toml file located at a specified URL.
+    Gets the names of the plugins listed in the plugin dependencies of an oasis
+    distribution. Successful results are cached for `OASIS_CACHE_TTL` seconds.
     Args:
-        plugin_name (str): The name of the plugin to check for.
         oasis_toml (OasisURLs): An object containing the URL to the pyproject.toml file.
     Returns:
-        bool: True if the plugin name is found in the optional dependencies, False
-              otherwise.
+        frozenset: The names of the plugins, or None if the pyproject.toml file could
+                   not be fetched or parsed.
     """
 
-    response = requests.get(oasis_toml.value)
+    cached = _oasis_plugins.get(oasis_toml)
+    if cached is not None and time.monotonic() - cached[0] < OASIS_CACHE_TTL:
+        return cached[1]
+    try:
+        response = circuit_breaker.get(oasis_toml.value)
+    except HostUnavailable as e:
+        click.echo(f'Failed to get pyproject.toml from {oasis_toml.value}: {e}')
+        return None
     if not response.ok:
         msg = f'Failed to get pyproject.toml from {oasis_toml.value}: {response.text}'
         click.echo(msg)
+        return None
     try:
         pyproject_data = toml.loads(response.text)
-    except toml.TomlDecodeError as e:
+        plugin_dependencies = pyproject_data['project']['optional-dependencies'][
+            'plugins'
+        ]
+    except (toml.TomlDecodeError, KeyError) as e:
         click.echo(f'Failed to parse pyproject.toml from {oasis_toml.value}: {e}')
-        return False
+        return None
     name_pattern = re.compile(r'^[^;>=<\s]+')
-    plugin_dependencies = pyproject_data['project']['optional-dependencies']['plugins']
-    return plugin_name in [name_pattern.match(d).group() for d in plugin_dependencies]
+    plugins = frozenset(name_pattern.match(d).group() for d in plugin_dependencies)
+    _oasis_plugins[oasis_toml] = (time.monotonic(), plugins)
+    return plugins
 
 
-def find_dependencies(project: dict, headers: dict) -> list[dict]:
+def on_gitlab_oasis(plugin_name: str, oasis_toml: OasisURLs) -> bool:
+    """
+    Checks if a given plugin name is listed in the plugin dependencies of a
+    pyproject.toml file located at a specified URL.
+    Args:
+        plugin_name (str): The name of the plugin to check for.
+        oasis_toml (OasisURLs): An object containing the URL to the pyproject.toml file.
+    Returns:
+        bool: True if the plugin name is found in the optional dependencies, False
+              otherwise, and None if it is unknown because the pyproject.toml file
+              could not be fetched.
+    """
+
+    plugins = get_oasis_plugins(oasis_toml)
+    if plugins is None:
+        return None
+    return plugin_name in plugins
+
+
+def is_on_pypi(plugin_name: str) -> bool:
+    """
+    Checks if a plugin is published on PyPI.
+    Args:
+        plugin_name (str): The name of the plugin to check for.
+    Returns:
+        bool: True if the plugin is on PyPI, False if it is not, and None if it is
+              unknown because PyPI could not be reached.
+    """
+
+    try:
+        return circuit_breaker.get(f'{PYPI_API}/{plugin_name}/json').ok
+    except HostUnavailable as e:
+        click.echo(f'Failed to check if {plugin_name} is on PyPI: {e}')
+        return None
+
+
+def resolve_dependency(dependency: str, headers: dict) -> PluginReferenceRecord:
+    """
+    Checks if a dependency is a NOMAD plugin, i.e. if it depends on 'nomad-lab'.
+    Args:
+        dependency (str): The dependency string from a pyproject.toml file.
+        headers (dict): A dictionary of HTTP headers to use when making requests
+                        to external services.
+    Returns:
+        PluginReferenceRecord: A record of the plugin dependency, or None if the
+                    dependency is not a plugin.
+    Raises:
+        HostUnavailable: If PyPI or GitHub cannot be reached.
+    """
+
+    name_pattern = re.compile(r'^[^;>=<\s]+')
+    git_pattern = re.compile(r'@ git\+(.*?)\.git(?:@[^#]+)?(?:#subdirectory=(.*))?')
+    name = name_pattern.match(dependency).group(0)
+    git_match = git_pattern.search(dependency)
+    toml_directory = ''
+    if git_match:
+        location = git_match.group(1)
+        if git_match.group(2):
+            toml_directory = git_match.group(2) + '/'
+        project = get_toml_project(location, toml_directory, headers)
+        if not any('nomad-lab' in d for d in project.get('dependencies', [])):
+            return None
+    else:
+        response = circuit_breaker.get(f'{PYPI_API}/{name}/json')
+        if not response.ok:
+            return None
+        response_json = response.json()
+        info = response_json.get('info', {})
+        dependencies = info.get('requires_dist', [])
+        if not dependencies or not any('nomad-lab' in d for d in dependencies):
+            return None
+        location = f'https://pypi.org/project/{name}/'
+
+    return PluginReferenceRecord(
+        name=intern_optional(name),
+        location=intern_optional(location),
+        toml_directory=intern_optional(toml_directory),
+    )
+
+
+def find_dependencies(
+    project: dict, headers: dict, unresolved: list[str] = None
+) -> list[PluginReferenceRecord]:
     """
     Finds and returns a list of plugin dependencies for a given project.
     This function examines the dependencies of a given project and identifies
@@ -173,10 +336,12 @@ def find_dependencies(project: dict, headers: dict) -> list[dict]:
                         strings.
         headers (dict): A dictionary of HTTP headers to use when making requests
                         to external services.
+        unresolved (list[str]): If given, the dependencies that could not be checked
+                        because PyPI or GitHub could not be reached are appended to
+                        it.
     Returns:
-        list[dict]: A list of dictionaries, each representing a plugin dependency.
-                    Each dictionary contains the following keys:
-                    - 'm_def': A string indicating the schema definition.
+        list[PluginReferenceRecord]: A list of records, each representing a plugin
+                    dependency with the following fields:
                     - 'name': The name of the dependency.
                     - 'location': The URL or location of the dependency.
                     - 'toml_directory': The subdirectory within the git repository
@@ -184,52 +349,29 @@ def find_dependencies(project: dict, headers: dict) -> list[dict]:
                                         is located (if applicable).
     """
 
-    name_pattern = re.compile(r'^[^;>=<\s]+')
-    git_pattern = re.compile(r'@ git\+(.*?)\.git(?:@[^#]+)?(?:#subdirectory=(.*))?')
     plugin_dependencies = []
     for dependency in project.get('dependencies', []):
-        name = name_pattern.match(dependency).group(0)
-        git_match = git_pattern.search(dependency)
-        toml_directory = ''
-        if git_match:
-            location = git_match.group(1)
-            if git_match.group(2):
-                toml_directory = git_match.group(2) + '/'
-            project = get_toml_project(location, toml_directory, headers)
-            if not any('nomad-lab' in d for d in project.get('dependencies', [])):
-                continue
-        else:
-            response = requests.get(f'https://pypi.org/pypi/{name}/json')
-            if not response.ok:
-                continue
-            response_json = response.json()
-            info = response_json.get('info', {})
-            dependencies = info.get('requires_dist', [])
-            if not dependencies or not any('nomad-lab' in d for d in dependencies):
-                continue
-            location = f'https://pypi.org/project/{name}/'
-
-        plugin_dependencies.append(
-            dict(
-                m_def='nomad_plugins.schema_packages.plugin.PluginReference',
-                name=name,
-                location=location,
-                toml_directory=toml_directory,
-            )
-        )
+        try:
+            plugin_dependency = resolve_dependency(dependency, headers)
+        except HostUnavailable as e:
+            click.echo(f'Failed to check dependency {dependency}: {e}')
+            if unresolved is not None:
+                unresolved.append(dependency)
+            continue
+        if plugin_dependency is not None:
+            plugin_dependencies.append(plugin_dependency)
     return plugin_dependencies
 
 
-def get_entry_points(toml_project: dict) -> dict:
+def get_entry_points(toml_project: dict) -> list[PluginEntryPointRecord]:
     """
     Extracts and categorizes plugin entry points from a given TOML project dictionary.
     Args:
         toml_project (dict): A dictionary representation of the project from a
         pyproject.toml file.
     Returns:
-        dict: A list of dictionaries, each representing a plugin entry point with the
-            following keys:
-            - m_def (str): The module definition for the plugin entry point.
+        list[PluginEntryPointRecord]: A list of records, each representing a plugin
+            entry point with the following fields:
             - name (str): The name of the entry point.
             - module (str): The module path of the entry point.
             - type (str or None): The type of the entry point, which can be one of the
@@ -239,24 +381,16 @@ def get_entry_points(toml_project: dict) -> dict:
     """
 
     entry_points = toml_project.get('entry-points', {}).get('nomad.plugin', {})
+    keywords = ('schema', 'parser', 'normalizer', 'app', 'example', 'api')
     plugin_entry_points = []
     for name, entry_point in entry_points.items():
         type = None
-        if 'schema' in entry_point or 'schema' in name:
-            type = 'Schema package'
-        elif 'parser' in entry_point or 'parser' in name:
-            type = 'Parser'
-        elif 'normalizer' in entry_point or 'normalizer' in name:
-            type = 'Normalizer'
-        elif 'app' in entry_point or 'app' in name:
-            type = 'App'
-        elif 'example' in entry_point or 'example' in name:
-            type = 'Example upload'
-        elif 'api' in entry_point or 'api' in name:
-            type = 'API'
+        for keyword, entry_point_type in zip(keywords, ENTRY_POINT_TYPES):
+            if keyword in entry_point or keyword in name:
+                type = entry_point_type
+                break
         plugin_entry_points.append(
-            dict(
-                m_def='nomad_plugins.schema_packages.plugin.PluginEntryPoint',
+            PluginEntryPointRecord(
                 name=name,
                 module=entry_point,
                 type=type,
@@ -265,24 +399,32 @@ def get_entry_points(toml_project: dict) -> dict:
     return plugin_entry_points
 
 
-def get_plugin(item: dict, headers: dict) -> dict:
+def get_plugin(item: dict, headers: dict, repo_details: dict = None) -> PluginRecord:
     """
     Extracts plugin information from a given repository item and returns it as a
-    dictionary.
+    plugin record.
     Args:
         item (dict): A dictionary containing repository item information, including the
                      repository details and file path.
         headers (dict): A dictionary containing HTTP headers for making requests to
                         external services.
+        repo_details (dict): The already fetched details of the repository. They are
+                        fetched from the GitHub API if not given.
     Returns:
-        dict: A dictionary containing the extracted plugin information, including
+        PluginRecord: A record containing the extracted plugin information, including
               repository details, project metadata, and plugin-specific attributes.
               Returns None if required information is missing or cannot be fetched.
+              Fields that could not be checked because a host was down are left
+              as None.
+    Raises:
+        HostUnavailable: If the repository details or the pyproject.toml file could
+                         not be fetched because GitHub is unavailable.
     """
 
     repo_info = item['repository']
     repo_full_name = repo_info['full_name']
-    repo_details = fetch_repo_details(repo_full_name, headers)
+    if repo_details is None:
+        repo_details = fetch_repo_details(repo_full_name, headers)
     if repo_details is None:
         return
     toml_directory = ''
@@ -292,42 +434,55 @@ def get_plugin(item: dict, headers: dict) -> dict:
     name = project.get('name', None)
     if name is None:
         return
-    plugin = dict(
-        m_def='nomad_plugins.schema_packages.plugin.Plugin',
+    unresolved = []
+    unknown = []
+    try:
+        created = fetch_file_created(repo_full_name, item['path'], headers)
+    except HostUnavailable as e:
+        click.echo(f'Failed to fetch commits for {repo_full_name}: {e}')
+        created = None
+        unknown.append('created')
+    checks = dict(
+        on_central=on_gitlab_oasis(name, OasisURLs.CENTRAL),
+        on_example_oasis=on_gitlab_oasis(name, OasisURLs.EXAMPLE),
+        on_pypi=is_on_pypi(name),
+    )
+    unknown.extend(field for field, value in checks.items() if value is None)
+    return PluginRecord(
         repository='https://github.com/' + repo_full_name,
         stars=repo_details['stargazers_count'],
-        created=fetch_file_created(
-            repo_full_name,
-            item['path'],
-            headers,
-        ),
+        created=created,
         last_updated=repo_details['pushed_at'],
-        owner=repo_info['owner']['login'],
+        owner=intern_optional(repo_info['owner']['login']),
         name=name,
         description=project.get('description', None),
-        authors=project.get('authors', []),
-        maintainers=project.get('maintainers', []),
-        plugin_dependencies=find_dependencies(project, headers),
-        on_central=on_gitlab_oasis(name, OasisURLs.CENTRAL),
-        on_example_oasis=on_gitlab_oasis(name, OasisURLs.EXAMPLE),
-        on_pypi=requests.get(f'https://pypi.org/pypi/{name}/json').ok,
+        authors=[
+            PyprojectAuthorRecord.from_toml(a) for a in project.get('authors', [])
+        ],
+        maintainers=[
+            PyprojectAuthorRecord.from_toml(a) for a in project.get('maintainers', [])
+        ],
+        plugin_dependencies=find_dependencies(project, headers, unresolved),
         plugin_entry_points=get_entry_points(project),
+        toml_directory=toml_directory[:-1],
+        unresolved_dependencies=unresolved or None,
+        unknown_fields=unknown or None,
+        **checks,
     )
-    plugin['toml_directory'] = toml_directory[:-1]
-    return plugin
 
 
-def find_plugins(token: str) -> dict:
+def iter_search_pages(headers: dict) -> Iterator[dict]:
     """
-    Find and retrieve Nomad plugins from GitHub repositories.
-    This function searches for repositories containing Nomad plugins by querying
-    the GitHub Code Search API. It retrieves the plugins from repositories that
-    have 'nomad.plugin' entry points defined in their `pyproject.toml` files.
+    Iterates over the pages of the GitHub Code Search API results for
+    `pyproject.toml` files that define 'nomad.plugin' entry points.
     Args:
-        token (str): GitHub personal access token for authentication.
-    Returns:
-        dict: A dictionary where keys are plugin names (repository full names with
-              slashes replaced by underscores) and values are the plugin data.
+        headers (dict): The headers to include in the request, typically containing
+                        the authorization token.
+    Yields:
+        dict: The JSON content of each page of search results.
+    Raises:
+        IncompleteSearch: If a page could not be fetched, so the results seen so
+                          far are not all plugins.
     """
 
     query = "project.entry-points.'nomad.plugin' in:file filename:pyproject.toml"
@@ -337,51 +492,238 @@ def find_plugins(token: str) -> dict:
         'order': 'desc',
         'per_page': 30,
     }
-    headers = {'Authorization': f'token {token}'}
+    page = 1
+    while True:
+        params['page'] = page
+        try:
+            response = circuit_breaker.get(
+                GITHUB_CODE_API, headers=headers, params=params
+            )
+        except HostUnavailable as e:
+            raise IncompleteSearch(f'Failed to fetch page {page}: {e}') from e
+        if not response.ok:
+            raise IncompleteSearch(
+                f'Failed to fetch page {page}: {response.status_code}, {response.text}'
+            )
+        yield response.json()
+        if 'next' in response.links:
+            page += 1
+        else:
+            return
+
+
+def find_plugins(
+    token: str,
+    on_plugin: Callable[[str, PluginRecord], None] = None,
+    select: Callable[[str], bool] = None,
+    missing: list[str] = None,
+    search_errors: list[str] = None,
+) -> dict:
+    """
+    Find and retrieve Nomad plugins from GitHub repositories.
+    This function searches for repositories containing Nomad plugins by querying
+    the GitHub Code Search API. It retrieves the plugins from repositories that
+    have 'nomad.plugin' entry points defined in their `pyproject.toml` files.
+    Repositories and fields that could not be fetched because a host was down are
+    tried once more at the end, after the open circuits have cooled down.
+    Args:
+        token (str): GitHub personal access token for authentication.
+        on_plugin (Callable[[str, PluginRecord], None]): Optional function that is
+              called with the name and record of each plugin as soon as it is found,
+              or after the final retry if some of its fields could not be checked.
+        select (Callable[[str], bool]): Optional function that is called with the
+              name of each search result and decides if it is crawled. All results
+              are crawled if not given.
+        missing (list[str]): If given, the names of the repositories that could not
+              be crawled because GitHub was unavailable are appended to it.
+        search_errors (list[str]): If given, the reason is appended to it if the
+              search results could not be fetched completely, in which case the
+              returned plugins are only part of the catalog.
+    Returns:
+        dict: A dictionary where keys are plugin names (repository full names with
+              slashes replaced by underscores) and values are the plugin records.
+    """
 
+    headers = {'Authorization': f'token {token}'}
     plugins = {}
-    page = 1
 
-    # Initial request to get the total number of items
-    response = requests.get(GITHUB_CODE_API, headers=headers, params=params)
-    if not response.ok:
-        click.echo(f'Failed to fetch data: {response.status_code}, {response.text}')
+    def iter_pages() -> Iterator[dict]:
+        try:
+            yield from iter_search_pages(headers)
+        except IncompleteSearch as e:
+            click.echo(f'The search results are incomplete: {e}')
+            if search_errors is not None:
+                search_errors.append(str(e))
+
+    pages = iter_pages()
+    first_page = next(pages, None)
+    if first_page is None:
         return plugins
 
-    search_results = response.json()
-    total_items = search_results['total_count']
+    total_items = first_page['total_count']
     click.echo(f'Found {total_items} repositories')
 
-    with click.progressbar(length=total_items, label='Processing repositories') as bar:
-        while True:
-            params['page'] = page
+    skipped = {}
+    # Plugins with fields that could not be checked are passed on after the retry
+    held_back = {}
 
-            response = requests.get(GITHUB_CODE_API, headers=headers, params=params)
+    def add(plugin_name: str, plugin: PluginRecord) -> None:
+        plugins[plugin_name] = plugin
+        if count_unknown({plugin_name: plugin}):
+            held_back[plugin_name] = plugin
+        elif on_plugin is not None:
+            on_plugin(plugin_name, plugin)
 
-            if not response.ok:
-                click.echo(
-                    f'Failed to fetch data: {response.status_code}, {response.text}'
-                )
-                break
-            search_results = response.json()
-            total_items = search_results['total_count']
+    with click.progressbar(length=total_items, label='Processing repositories') as bar:
+        for search_results in itertools.chain([first_page], pages):
             for item in search_results['items']:
                 plugin_name = item['repository']['full_name'].replace('/', '_')
-                plugins[plugin_name] = get_plugin(item, headers)
+                if select is None or select(plugin_name):
+                    try:
+                        plugin = get_plugin(item, headers)
+                    except HostUnavailable as e:
+                        click.echo(f'Failed to get plugin from {plugin_name}: {e}')
+                        skipped[plugin_name] = item
+                    else:
+                        if plugin is not None:
+                            add(plugin_name, plugin)
                 bar.update(1)
-            if 'next' in response.links:
-                page += 1
-            else:
-                break
+
+    if skipped or held_back:
+        circuit_breaker.wait_for_recovery()
+    for plugin_name, plugin in retry_plugins(skipped, headers, missing).items():
+        add(plugin_name, plugin)
+    unknown = fill_unknown(held_back, headers)
+    if unknown:
+        click.echo(f'{unknown} fields could not be checked and are left unknown')
+    if on_plugin is not None:
+        for plugin_name, plugin in held_back.items():
+            on_plugin(plugin_name, plugin)
+    return plugins
+
+
+def retry_plugins(skipped: dict, headers: dict, missing: list[str] = None) -> dict:
+    """
+    Crawls the search results that were skipped because GitHub was unavailable
+    once more.
+    Args:
+        skipped (dict): The search result items by plugin name.
+        headers (dict): A dictionary of HTTP headers to use when making requests
+                        to external services.
+        missing (list[str]): If given, the names of the repositories that still
+                        could not be crawled are appended to it.
+    Returns:
+        dict: The plugin records that could be crawled by name.
+    """
+
+    plugins = {}
+    for plugin_name, item in skipped.items():
+        try:
+            plugin = get_plugin(item, headers)
+        except HostUnavailable as e:
+            click.echo(f'Failed to get plugin from {plugin_name} again: {e}')
+            if missing is not None:
+                missing.append(plugin_name)
+            continue
+        if plugin is not None:
+            plugins[plugin_name] = plugin
     return plugins
 
 
+def count_unknown(plugins: dict) -> int:
+    """
+    Counts the fields and dependencies of plugins that are unknown because a host
+    was down.
+    Args:
+        plugins (dict): The plugin records by key.
+    Returns:
+        int: The number of unknown fields and dependencies.
+    """
+
+    return sum(
+        len(plugin.unknown_fields or []) + len(plugin.unresolved_dependencies or [])
+        for plugin in plugins.values()
+    )
+
+
+def check_field(plugin: PluginRecord, field: str, headers: dict):
+    """
+    Checks a field of a plugin that was left unknown because a host was down.
+    Args:
+        plugin (PluginRecord): The plugin.
+        field (str): The name of the field, one of 'created', 'on_pypi',
+                     'on_central' or 'on_example_oasis'.
+        headers (dict): A dictionary of HTTP headers to use when making requests
+                        to external services.
+    Returns:
+        The value of the field, or None if it is still unknown.
+    Raises:
+        HostUnavailable: If the creation date could not be fetched.
+    """
+
+    if field == 'created':
+        toml_path = 'pyproject.toml'
+        if plugin.toml_directory:
+            toml_path = f'{plugin.toml_directory}/{toml_path}'
+        repo_name = plugin.repository.removeprefix('https://github.com/')
+        return fetch_file_created(repo_name, toml_path, headers)
+    if field == 'on_pypi':
+        return is_on_pypi(plugin.name)
+    if field == 'on_central':
+        return on_gitlab_oasis(plugin.name, OasisURLs.CENTRAL)
+    return on_gitlab_oasis(plugin.name, OasisURLs.EXAMPLE)
+
+
+def fill_unknown(plugins: dict, headers: dict) -> int:
+    """
+    Checks the fields of plugins that were left unknown because a host was down
+    once more and fills them in where the host has recovered.
+    Args:
+        plugins (dict): The plugin records by key.
+        headers (dict): A dictionary of HTTP headers to use when making requests
+                        to external services.
+    Returns:
+        int: The number of fields and dependencies that are still unknown.
+    """
+
+    for plugin in plugins.values():
+        unknown = []
+        for field in plugin.unknown_fields or []:
+            try:
+                value = check_field(plugin, field, headers)
+            except HostUnavailable:
+                unknown.append(field)
+                continue
+            # A missing creation date is an answer, the other checks return None
+            # if their host is down
+            if value is None and field != 'created':
+                unknown.append(field)
+            setattr(plugin, field, value)
+        plugin.unknown_fields = unknown or None
+        if not plugin.unresolved_dependencies:
+            continue
+        unresolved = []
+        for dependency in plugin.unresolved_dependencies:
+            try:
+                plugin_dependency = resolve_dependency(dependency, headers)
+            except HostUnavailable:
+                unresolved.append(dependency)
+                continue
+            if plugin_dependency is not None:
+                plugin.plugin_dependencies = [
+                    *(plugin.plugin_dependencies or []),
+                    plugin_dependency,
+                ]
+        plugin.unresolved_dependencies = unresolved or None
+    return count_unknown(plugins)
+
+
 def save_plugins(plugins: dict, save_path: str) -> None:
     """
     Save plugins to JSON files and create a zip archive of the saved files.
     Args:
         plugins (dict): A dictionary where keys are plugin names and values are plugin
-                        data.
+                        records.
         save_path (str): The directory path where the JSON files will be saved and the
                          zip archive will be created.
     Returns:
@@ -390,12 +732,43 @@ def save_plugins(plugins: dict, save_path: str) -> None:
 
     for name, plugin in plugins.items():
         save_file = os.path.join(save_path, f'{name}.archive.json')
-        with open(save_file, 'w') as f:
-            json.dump({'data': plugin}, f, indent=4)
+        with open(save_file, 'w', encoding='utf-8') as f:
+            f.write(dumps_archive(plugin))
 
     shutil.make_archive(save_path, 'zip', save_path)
 
 
+def iter_plugins(save_path: str) -> Iterator[tuple[str, PluginRecord]]:
+    """
+    Reads the plugins saved by `save_plugins` one archive file at a time.
+    Args:
+        save_path (str): The directory path where the JSON files were saved.
+    Yields:
+        tuple[str, PluginRecord]: The plugin name and record, sorted by name.
+    """
+
+    suffix = '.archive.json'
+    for save_file in sorted(glob.glob(os.path.join(save_path, f'*{suffix}'))):
+        with open(save_file, encoding='utf-8') as f:
+            data = json.load(f).get('data')
+        if data:
+            name = os.path.basename(save_file)[: -len(suffix)]
+            yield name, PluginRecord.from_archive(data)
+
+
+def load_plugins(save_path: str) -> dict:
+    """
+    Loads the plugins saved by `save_plugins`.
+    Args:
+        save_path (str): The directory path where the JSON files were saved.
+    Returns:
+        dict: A dictionary where keys are plugin names and values are plugin
+              records, sorted by name.
+    """
+
+    return dict(iter_plugins(save_path))
+
+
 def get_authentication_token(nomad_url: str, username: str, password: str) -> str:
     """
     Retrieves an authentication token from the specified Nomad URL using the provided
@@ -460,7 +833,86 @@ def upload_to_NOMAD(nomad_url: str, token: str, upload_file: str) -> str:
             return
 
 
-@click.command()
+def add_to_NOMAD_upload(
+    nomad_url: str, token: str, upload_id: str, upload_file: str
+) -> bool:
+    """
+    Adds the files of a zip archive to an existing NOMAD upload, overwriting files
+    with the same name. Only the added entries are processed again.
+    Args:
+        nomad_url (str): The URL of the NOMAD server.
+        token (str): The authorization token for accessing the NOMAD server.
+        upload_id (str): The ID of the upload to add the files to.
+        upload_file (str): The path to the zip archive to be added.
+    Returns:
+        bool: True if the files were added successfully, otherwise False.
+    """
+
+    with open(upload_file, 'rb') as f:
+        try:
+            response = requests.put(
+                nomad_url + f'uploads/{upload_id}/raw/',
+                headers={
+                    'Authorization': f'Bearer {token}',
+                    'Accept': 'application/json',
+                },
+                params=dict(file_name=os.path.basename(upload_file)),
+                data=f,
+                timeout=30,
+            )
+            if response.ok:
+                return True
+
+            click.echo(f'failed to add files to NOMAD upload {upload_id}: ')
+            click.echo(response.text)
+            return False
+        except Exception:
+            click.echo('something went wrong uploading to NOMAD')
+            return False
+
+
+class DefaultCommandGroup(click.Group):
+    """
+    A command group that runs its default command if the arguments do not start
+    with the name of a command. This keeps `plugin-crawler --github-token ...`
+    working as before the subcommands were added.
+    """
+
+    default_command = 'crawl'
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if not args or (args[0] not in self.commands and args[0] != '--help'):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultCommandGroup)
+def main():
+    """
+    Crawls GitHub for NOMAD plugins and uploads them to NOMAD. Runs `crawl` if no
+    command is given.
+    """
+
+
+def import_catalog_export():
+    """
+    Imports the module for exporting columnar catalogs, which requires the optional
+    `pyarrow` dependency.
+    Returns:
+        module: The `nomad_plugins.catalog_export` module.
+    """
+
+    try:
+        from nomad_plugins import catalog_export
+    except ImportError as e:
+        raise click.ClickException(
+            'Exporting the catalog requires pyarrow. '
+            'Install it with `pip install nomad-plugins[export]`.'
+        ) from e
+    return catalog_export
+
+
+@main.command()
 @click.option(
     '--github-token', prompt='GitHub Token', help='Your GitHub personal access token.'
 )
@@ -475,26 +927,366 @@ def upload_to_NOMAD(nomad_url: str, token: str, upload_file: str) -> str:
 @click.option(
     '--save-path', prompt='Save Path', help='The path to save the plugin archives.'
 )
-def main(github_token, nomad_url, nomad_username, nomad_password, save_path):
+@click.option(
+    '--export-path',
+    default=None,
+    help='The directory to additionally write a columnar catalog of the plugins to.',
+)
+@click.option(
+    '--export-format',
+    type=click.Choice(['arrow', 'parquet']),
+    default='arrow',
+    show_default=True,
+    help='The format of the columnar catalog.',
+)
+@click.option(
+    '--allow-incomplete',
+    is_flag=True,
+    help='Upload even if the search or some repositories could not be crawled.',
+)
+def crawl(  # noqa: PLR0913, PLR0917
+    github_token,
+    nomad_url,
+    nomad_username,
+    nomad_password,
+    save_path,
+    export_path,
+    export_format,
+    allow_incomplete,
+):
     """
-    Main function to find plugins, save them, and upload to NOMAD.
+    Finds all plugins, saves them, and uploads them to NOMAD.
+    \f
     Args:
         github_token (str): GitHub token for authentication to access plugins.
         nomad_url (str): URL of the NOMAD service.
         nomad_username (str): Username for NOMAD authentication.
         nomad_password (str): Password for NOMAD authentication.
         save_path (str): Path to save the plugins data.
+        export_path (str): Directory to write the columnar catalog to, if any.
+        export_format (str): Format of the columnar catalog.
+        allow_incomplete (bool): Upload even if repositories could not be crawled.
     Returns:
         None
     """
 
-    plugins = find_plugins(github_token)
+    missing = []
+    search_errors = []
+    if export_path:
+        catalog_export = import_catalog_export()
+        with catalog_export.CatalogWriter(export_path, export_format) as writer:
+            plugins = find_plugins(
+                github_token,
+                writer.write,
+                missing=missing,
+                search_errors=search_errors,
+            )
+    else:
+        plugins = find_plugins(
+            github_token, missing=missing, search_errors=search_errors
+        )
     save_plugins(plugins, save_path)
+    if (missing or search_errors) and not allow_incomplete:
+        reason = (
+            f'{len(missing)} repositories could not be crawled, e.g. {missing[0]}'
+            if missing
+            else f'The search results are incomplete: {search_errors[0]}'
+        )
+        raise click.ClickException(
+            f'{reason}. The plugins found are saved in {save_path} but were not '
+            'uploaded. Crawl again or pass --allow-incomplete.'
+        )
     token = get_authentication_token(nomad_url, nomad_username, nomad_password)
     if token:
         upload_id = upload_to_NOMAD(nomad_url, token, save_path + '.zip')
         click.echo(f'Uploaded to NOMAD upload: {upload_id}')
 
 
+@main.command()
+@click.option(
+    '--archive-path',
+    prompt='Archive Path',
+    help='The directory containing the plugin archives written by `crawl`.',
+)
+@click.option(
+    '--export-path',
+    prompt='Export Path',
+    help='The directory to write the columnar catalog to.',
+)
+@click.option(
+    '--export-format',
+    type=click.Choice(['arrow', 'parquet']),
+    default='arrow',
+    show_default=True,
+    help='The format of the columnar catalog.',
+)
+def export(archive_path, export_path, export_format):
+    """
+    Converts saved plugin archives into a columnar catalog.
+    """
+
+    catalog_export = import_catalog_export()
+    count = catalog_export.export_archives(archive_path, export_path, export_format)
+    click.echo(f'Exported {count} plugins to {export_path}')
+
+
+@main.command()
+@click.option(
+    '--github-token', prompt='GitHub Token', help='Your GitHub personal access token.'
+)
+@click.option('--nomad-url', prompt='NOMAD URL', help='The NOMAD upload URL.')
+@click.option('--nomad-username', prompt='NOMAD Username', help='Your NOMAD username.')
+@click.option(
+    '--nomad-password',
+    prompt='NOMAD Password',
+    help='Your NOMAD upload password.',
+    hide_input=True,
+)
+@click.option(
+    '--save-path',
+    prompt='Save Path',
+    help='The directory to save the incremental plugin archives in.',
+)
+@click.option(
+    '--upload-id',
+    default=None,
+    help='The NOMAD upload to add changed plugins to. A new one is created if not '
+    'given.',
+)
+@click.option(
+    '--min-interval',
+    default=600.0,
+    show_default=True,
+    help='The minimum time in seconds between checks of a repository.',
+)
+@click.option(
+    '--max-interval',
+    default=7 * 24 * 3600.0,
+    show_default=True,
+    help='The maximum time in seconds between checks of a repository.',
+)
+@click.option(
+    '--discovery-interval',
+    default=6 * 3600.0,
+    show_default=True,
+    help='The time in seconds between sweeps for new plugins.',
+)
+@click.option(
+    '--emit-interval',
+    default=900.0,
+    show_default=True,
+    help='The time in seconds between uploads of changed plugins.',
+)
+def serve(  # noqa: PLR0913, PLR0917
+    github_token,
+    nomad_url,
+    nomad_username,
+    nomad_password,
+    save_path,
+    upload_id,
+    min_interval,
+    max_interval,
+    discovery_interval,
+    emit_interval,
+):
+    """
+    Continuously crawls plugins, checking active repositories more often than
+    dormant ones, and uploads changed plugins to NOMAD.
+    """
+
+    from nomad_plugins.crawl_scheduler import CrawlScheduler
+
+    state = dict(upload_id=upload_id)
+    os.makedirs(save_path, exist_ok=True)
+
+    def emit(plugins: dict) -> bool:
+        # A fresh directory per batch, so the zip only contains this batch and no
+        # stale archives of an earlier run overwrite newer entries in the upload
+        batch_path = tempfile.mkdtemp(prefix='changes-', dir=save_path)
+        save_plugins(plugins, batch_path)
+        try:
+            token = get_authentication_token(nomad_url, nomad_username, nomad_password)
+            if not token:
+                return False
+            if state['upload_id'] is None:
+                state['upload_id'] = upload_to_NOMAD(
+                    nomad_url, token, batch_path + '.zip'
+                )
+                if state['upload_id'] is None:
+                    return False
+                click.echo(f'Uploaded to NOMAD upload: {state["upload_id"]}')
+                return True
+            if not add_to_NOMAD_upload(
+                nomad_url, token, state['upload_id'], batch_path + '.zip'
+            ):
+                return False
+            click.echo(
+                f'Added {len(plugins)} changed plugins to NOMAD upload: '
+                f'{state["upload_id"]}'
+            )
+            return True
+        finally:
+            # A failed batch stays pending in the scheduler and is saved again
+            shutil.rmtree(batch_path)
+            os.remove(batch_path + '.zip')
+
+    scheduler = CrawlScheduler(
+        headers={'Authorization': f'token {github_token}'},
+        emit=emit,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        discovery_interval=discovery_interval,
+        emit_interval=emit_interval,
+    )
+    scheduler.run()
+
+
+@main.command()
+@click.option(
+    '--save-path',
+    prompt='Save Path',
+    help='The path of the plugin archives to profile. They are updated in place.',
+)
+@click.option(
+    '--wheelhouse',
+    prompt='Wheelhouse',
+    help='The directory containing the wheels of the plugins and their dependencies.',
+)
+@click.option(
+    '--work-dir',
+    default=None,
+    help='The directory to create the isolated environments in. Defaults to a '
+    'temporary directory.',
+)
+@click.option(
+    '--workers',
+    default=None,
+    type=int,
+    help='The number of plugins to profile in parallel. Defaults to the CPU count.',
+)
+@click.option(
+    '--timeout',
+    default=300.0,
+    show_default=True,
+    help='The time in seconds after which loading an entry point is aborted.',
+)
+def profile(save_path, wheelhouse, work_dir, workers, timeout):
+    """
+    Measures the import time and memory cost of the entry points of saved plugins.
+    """
+
+    from nomad_plugins.import_profiler import profile_plugins
+
+    plugins = load_plugins(save_path)
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        profiled = profile_plugins(
+            plugins, wheelhouse, tmp, workers=workers, timeout=timeout
+        )
+    save_plugins(plugins, save_path)
+    click.echo(f'Profiled {profiled} entry points of {len(plugins)} plugins')
+
+
+@main.command()
+@click.option(
+    '--github-token', prompt='GitHub Token', help='The GitHub token of this node.'
+)
+@click.option(
+    '--shard-index',
+    type=int,
+    prompt='Shard Index',
+    help='The index of the shard to crawl, starting at 0.',
+)
+@click.option(
+    '--shard-count', type=int, prompt='Shard Count', help='The number of shards.'
+)
+@click.option(
+    '--save-path',
+    prompt='Save Path',
+    help='The directory to save the plugin archives and the shard manifest in.',
+)
+def shard(github_token, shard_index, shard_count, save_path):
+    """
+    Crawls one shard of the plugins for a later `merge`. The repositories are
+    assigned to shards by a hash of their name, so several nodes can crawl
+    disjoint shards with their own tokens.
+    """
+
+    from nomad_plugins.sharded_crawl import crawl_shard
+
+    if not 0 <= shard_index < shard_count:
+        raise click.BadParameter(
+            f'must be in [0, {shard_count})', param_hint='--shard-index'
+        )
+    manifest = crawl_shard(github_token, shard_index, shard_count, save_path)
+    click.echo(
+        f'Crawled {len(manifest["crawled"])} of {len(manifest["assigned"])} '
+        f'repositories of shard {shard_index} of {shard_count}'
+    )
+    if manifest['search_errors']:
+        click.echo(
+            'The search results were incomplete, crawl the shard again before merging'
+        )
+    if manifest['missing']:
+        click.echo(
+            f'{len(manifest["missing"])} repositories could not be crawled, crawl '
+            'the shard again before merging'
+        )
+
+
+@main.command()
+@click.option(
+    '--shard-path',
+    multiple=True,
+    required=True,
+    help='A directory written by `shard`. Give it once per shard.',
+)
+@click.option(
+    '--save-path', prompt='Save Path', help='The path to save the plugin archives.'
+)
+@click.option(
+    '--allow-incomplete',
+    is_flag=True,
+    help='Merge even if shards are missing or saw different search results.',
+)
+@click.option(
+    '--nomad-url',
+    default=None,
+    help='The NOMAD upload URL. The merged archives are only uploaded if given.',
+)
+@click.option('--nomad-username', default=None, help='Your NOMAD username.')
+@click.option('--nomad-password', default=None, help='Your NOMAD upload password.')
+def merge(  # noqa: PLR0913, PLR0917
+    shard_path,
+    save_path,
+    allow_incomplete,
+    nomad_url,
+    nomad_username,
+    nomad_password,
+):
+    """
+    Merges the shards crawled by `shard` into a single archive and optionally
+    uploads it to NOMAD.
+    """
+
+    from nomad_plugins.sharded_crawl import ShardMergeError, merge_shards
+
+    try:
+        summary = merge_shards(
+            list(shard_path), save_path, allow_incomplete=allow_incomplete
+        )
+    except ShardMergeError as e:
+        raise click.ClickException(f'Cannot merge the shards:\n{e}') from e
+    click.echo(
+        f'Merged {summary["plugins"]} plugins from {summary["shards"]} shards '
+        f'({summary["duplicates"]} duplicates, {summary["skipped"]} repositories '
+        f'without a plugin) into {summary["zip_path"]}'
+    )
+    if nomad_url:
+        token = get_authentication_token(nomad_url, nomad_username, nomad_password)
+        if token:
+            upload_id = upload_to_NOMAD(nomad_url, token, summary['zip_path'])
+            click.echo(f'Uploaded to NOMAD upload: {upload_id}')
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,281 @@
+import json
+import sys
+from datetime import datetime, timezone
+from json.encoder import encode_basestring
+from typing import Optional
+
+SCHEMA_MODULE = 'nomad_plugins.schema_packages.plugin'
+
+ENTRY_POINT_TYPES = tuple(
+    sys.intern(t)
+    for t in (
+        'Schema package',
+        'Parser',
+        'Normalizer',
+        'App',
+        'Example upload',
+        'API',
+    )
+)
+
+# The activity of a plugin by the number of days since its last push
+ACTIVITY_BUCKETS = (
+    (90, 'Active'),
+    (365, 'Maintained'),
+)
+INACTIVE = 'Inactive'
+
+# The JSON of the common quantity values by type, other values go through `json`
+encode_json = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+JSON_SCALARS = {
+    str: encode_basestring,
+    bool: {True: 'true', False: 'false'}.__getitem__,
+    int: int.__repr__,
+}
+
+
+def intern_optional(value: Optional[str]) -> Optional[str]:
+    """
+    Interns a string if it is not None.
+    Args:
+        value (Optional[str]): The string to intern.
+    Returns:
+        Optional[str]: The interned string or None.
+    """
+
+    return None if value is None else sys.intern(value)
+
+
+def activity_of(days: int) -> str:
+    """
+    Gets the activity bucket of a plugin.
+    Args:
+        days (int): The number of full days since the last push.
+    Returns:
+        str: The label of the bucket, e.g. 'Active'.
+    """
+
+    return next((label for limit, label in ACTIVITY_BUCKETS if days <= limit), INACTIVE)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Converts an ISO 8601 timestamp as returned by the GitHub API into a datetime.
+    Args:
+        value (Optional[str]): The timestamp, e.g. '2024-10-01T12:00:00Z'.
+    Returns:
+        Optional[datetime]: The timezone aware datetime or None if no value was
+            given.
+    """
+
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class Record:
+    """
+    Base class for the compact records produced by the plugin crawler.
+
+    Subclasses list their quantities in `__slots__` (in the order they should be
+    serialized) and set `m_def` to the interned name of the corresponding section in
+    `nomad_plugins.schema_packages.plugin`. Quantities that are None are left out of
+    the archive, as are the `transient` fields that only live during the crawl.
+    """
+
+    __slots__ = ()
+    __hash__ = None
+    m_def: str = ''
+    subsections: dict = {}
+    transient: frozenset = frozenset()
+    # The serialized fields, whether they are sub-sections and their JSON keys, set
+    # per subclass
+    archive_fields: tuple = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.archive_fields = tuple(
+            (field, field in cls.subsections, f'"{field}":')
+            for field in cls.__slots__
+            if field not in cls.transient
+        )
+
+    def __init__(self, **kwargs) -> None:
+        for field in self.__slots__:
+            setattr(self, field, kwargs.pop(field, None))
+        if kwargs:
+            raise TypeError(
+                f'Unexpected fields for {type(self).__name__}: {", ".join(kwargs)}'
+            )
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{f}={getattr(self, f)!r}' for f in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def to_archive(self, with_m_def: bool = True) -> dict:
+        """
+        Converts the record into the archive section dictionary that NOMAD expects.
+        The sub-sections are written without `m_def`, as their section is fixed by
+        the schema.
+        Args:
+            with_m_def (bool): Whether to include the `m_def` of the section.
+        Returns:
+            dict: The section as a dictionary.
+        """
+
+        archive = {'m_def': self.m_def} if with_m_def else {}
+        for field, is_subsection, _ in self.archive_fields:
+            value = getattr(self, field)
+            if value is None:
+                continue
+            if is_subsection:
+                value = [v.to_archive(False) for v in value]
+            archive[field] = value
+        return archive
+
+    def write_json(self, parts: list[str], with_m_def: bool = True) -> None:
+        """
+        Writes the JSON of `to_archive` without building the dictionaries first.
+        Args:
+            parts (list[str]): The list to append the pieces of the JSON string to.
+            with_m_def (bool): Whether to include the `m_def` of the section.
+        """
+
+        parts.append('{')
+        separator = ''
+        if with_m_def:
+            parts.append(f'"m_def":{encode_basestring(self.m_def)}')
+            separator = ','
+        for field, is_subsection, key in self.archive_fields:
+            value = getattr(self, field)
+            if value is None:
+                continue
+            parts.append(separator)
+            parts.append(key)
+            separator = ','
+            if is_subsection:
+                parts.append('[')
+                for i, subsection in enumerate(value):
+                    if i:
+                        parts.append(',')
+                    subsection.write_json(parts, False)
+                parts.append(']')
+            else:
+                parts.append(JSON_SCALARS.get(type(value), encode_json)(value))
+        parts.append('}')
+
+    @classmethod
+    def from_archive(cls, archive: dict) -> 'Record':
+        """
+        Creates a record from an archive section dictionary as written by
+        `to_archive`. Keys that are not quantities of the record are ignored.
+        Args:
+            archive (dict): The section as a dictionary.
+        Returns:
+            Record: The record.
+        """
+
+        record = cls()
+        for field in cls.__slots__:
+            value = archive.get(field)
+            if value is not None and field in cls.subsections:
+                value = [cls.subsections[field].from_archive(v) for v in value]
+            setattr(record, field, value)
+        return record
+
+
+class PyprojectAuthorRecord(Record):
+    __slots__ = ('name', 'email')
+    m_def = sys.intern(f'{SCHEMA_MODULE}.PyprojectAuthor')
+
+    @classmethod
+    def from_toml(cls, author: dict) -> 'PyprojectAuthorRecord':
+        """
+        Creates an author record from an entry of the `authors` or `maintainers` list
+        in a `pyproject.toml` file.
+        Args:
+            author (dict): The author table from the `pyproject.toml` file.
+        Returns:
+            PyprojectAuthorRecord: The author record.
+        """
+
+        return cls(name=author.get('name'), email=author.get('email'))
+
+
+class ImportTimeRecord(Record):
+    __slots__ = ('module', 'self_time', 'cumulative_time')
+    m_def = sys.intern(f'{SCHEMA_MODULE}.ImportTime')
+
+
+class PluginEntryPointRecord(Record):
+    __slots__ = (
+        'name',
+        'module',
+        'type',
+        'import_time',
+        'import_rss_delta',
+        'import_time_breakdown',
+    )
+    m_def = sys.intern(f'{SCHEMA_MODULE}.PluginEntryPoint')
+    subsections = {'import_time_breakdown': ImportTimeRecord}
+
+
+class PluginReferenceRecord(Record):
+    __slots__ = ('name', 'location', 'toml_directory')
+    m_def = sys.intern(f'{SCHEMA_MODULE}.PluginReference')
+
+
+class PluginRecord(Record):
+    __slots__ = (
+        'repository',
+        'stars',
+        'created',
+        'last_updated',
+        'owner',
+        'name',
+        'description',
+        'authors',
+        'maintainers',
+        'plugin_dependencies',
+        'on_central',
+        'on_example_oasis',
+        'on_pypi',
+        'plugin_entry_points',
+        'toml_directory',
+        'unresolved_dependencies',
+        'unknown_fields',
+    )
+    m_def = sys.intern(f'{SCHEMA_MODULE}.Plugin')
+    # The dependency strings and the names of the fields that could not be checked
+    # because a host was down
+    transient = frozenset({'unresolved_dependencies', 'unknown_fields'})
+    subsections = {
+        'authors': PyprojectAuthorRecord,
+        'maintainers': PyprojectAuthorRecord,
+        'plugin_dependencies': PluginReferenceRecord,
+        'plugin_entry_points': PluginEntryPointRecord,
+    }
+
+
+def dumps_archive(plugin: PluginRecord) -> str:
+    """
+    Serializes a plugin record to the JSON of a `*.archive.json` file.
+    Args:
+        plugin (PluginRecord): The plugin record to serialize.
+    Returns:
+        str: The archive as a compact JSON string, the same as `json.dumps` of
+             `to_archive` with compact separators.
+    """
+
+    parts = ['{"data":']
+    plugin.write_json(parts)
+    parts.append('}')
+    return ''.join(parts)
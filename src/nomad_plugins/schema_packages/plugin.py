@@ -1,7 +1,9 @@
+from datetime import datetime, timezone
 from typing import (
     TYPE_CHECKING,
 )
 
+import numpy as np
 from nomad.datamodel.datamodel import EntryMetadata
 from nomad.datamodel.results import ELN, Results
 
@@ -20,6 +22,8 @@ from nomad.config import config
 from nomad.datamodel.data import ArchiveSection, Schema
 from nomad.metainfo import Datetime, MEnum, Quantity, SchemaPackage, SubSection
 
+from nomad_plugins.records import ACTIVITY_BUCKETS, INACTIVE, activity_of
+
 configuration: 'PluginSchemaPackageEntryPoint' = config.get_plugin_entry_point(
     'nomad_plugins.schema_packages:schema_package_entry_point'
 )
@@ -36,6 +40,22 @@ class PyprojectAuthor(ArchiveSection):
     )
 
 
+class ImportTime(ArchiveSection):
+    module = Quantity(
+        type=str,
+    )
+    self_time = Quantity(
+        type=np.float64,
+        unit='s',
+        description='The time spent importing the module itself.',
+    )
+    cumulative_time = Quantity(
+        type=np.float64,
+        unit='s',
+        description='The time spent importing the module including its imports.',
+    )
+
+
 class PluginEntryPoint(ArchiveSection):
     name = Quantity(
         type=str,
@@ -48,6 +68,27 @@ class PluginEntryPoint(ArchiveSection):
             'App', 'Schema package', 'Normalizer', 'Parser', 'Example upload', 'API'
         )
     )
+    import_time = Quantity(
+        type=np.float64,
+        unit='s',
+        description=(
+            'The time it took to import and `load()` the entry point in a fresh '
+            'interpreter.'
+        ),
+    )
+    import_rss_delta = Quantity(
+        type=np.int64,
+        unit='byte',
+        description=(
+            'The increase of the resident memory of a fresh interpreter from '
+            'importing and `load()`-ing the entry point.'
+        ),
+    )
+    import_time_breakdown = SubSection(
+        section=ImportTime,
+        repeats=True,
+        description='The modules with the highest self import time.',
+    )
 
 
 class Plugin(Schema):
@@ -100,9 +141,71 @@ class Plugin(Schema):
         section='PluginReference',
         repeats=True,
     )
+    n_plugin_dependencies = Quantity(
+        type=int,
+        description='The number of plugins this plugin depends on.',
+    )
+    n_plugin_entry_points = Quantity(
+        type=int,
+        description='The number of entry points provided by this plugin.',
+    )
+    plugin_entry_point_types = Quantity(
+        type=str,
+        description=(
+            'The sorted and deduplicated types of the entry points provided by this '
+            'plugin, separated by commas.'
+        ),
+    )
+    activity = Quantity(
+        type=MEnum(*[label for _, label in ACTIVITY_BUCKETS], INACTIVE),
+        description=(
+            'How recently the repository was pushed to at the time of processing. '
+            '"Active" within 90 days, "Maintained" within a year, otherwise '
+            '"Inactive". The continuous crawl reprocesses plugins when they move '
+            'to another bucket.'
+        ),
+    )
+    total_import_time = Quantity(
+        type=np.float64,
+        unit='s',
+        description='The sum of the import times of all profiled entry points.',
+    )
+    max_import_rss_delta = Quantity(
+        type=np.int64,
+        unit='byte',
+        description='The largest memory increase of all profiled entry points.',
+    )
+
+    def normalize_aggregates(self) -> None:
+        """
+        Computes the derived quantities that are used for filtering and aggregating
+        plugins in the app.
+        """
+
+        self.n_plugin_dependencies = len(self.plugin_dependencies)
+        self.n_plugin_entry_points = len(self.plugin_entry_points)
+        types = sorted({ep.type for ep in self.plugin_entry_points if ep.type})
+        self.plugin_entry_point_types = ', '.join(types) if types else None
+        profiled = [ep for ep in self.plugin_entry_points if ep.import_time is not None]
+        self.total_import_time = (
+            sum(ep.import_time for ep in profiled) if profiled else None
+        )
+        rss_deltas = [
+            ep.import_rss_delta for ep in profiled if ep.import_rss_delta is not None
+        ]
+        self.max_import_rss_delta = max(rss_deltas) if rss_deltas else None
+        self.activity = None
+        if self.last_updated:
+            last_updated = self.last_updated
+            if last_updated.tzinfo is None:
+                last_updated = last_updated.replace(tzinfo=timezone.utc)
+            self.activity = activity_of(
+                (datetime.now(timezone.utc) - last_updated).days
+            )
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
+        self.normalize_aggregates()
         if not archive.metadata:
             archive.metadata = EntryMetadata()
         if not archive.results:
@@ -122,6 +225,34 @@ class Plugin(Schema):
             archive.metadata.comment = self.description
 
 
+def search_lab_id(archive: 'EntryArchive', lab_id: str) -> tuple[int, list[dict]]:
+    """
+    Searches for entries with the given lab ID. Load tests replace this function with
+    a local stand-in for the search.
+    Args:
+        archive (EntryArchive): The archive of the entry doing the search.
+        lab_id (str): The lab ID to search for.
+    Returns:
+        tuple[int, list[dict]]: The total number of hits and the first hit, or None if
+            the archive is not processed on a NOMAD server.
+    """
+
+    from nomad.datamodel.context import ServerContext
+
+    if not isinstance(archive.m_context, ServerContext):
+        return None
+    from nomad.search import MetadataPagination, search
+
+    query = {'results.eln.lab_ids': lab_id}
+    search_result = search(
+        owner='all',
+        query=query,
+        pagination=MetadataPagination(page_size=1),
+        user_id=archive.metadata.main_author.user_id,
+    )
+    return search_result.pagination.total, search_result.data
+
+
 class PluginReference(ArchiveSection):
     name = Quantity(
         type=str,
@@ -138,26 +269,17 @@ class PluginReference(ArchiveSection):
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        from nomad.datamodel.context import ServerContext
-
-        if not isinstance(archive.m_context, ServerContext):
+        result = search_lab_id(archive, self.location)
+        if result is None:
             return
-        from nomad.search import MetadataPagination, search
-
-        query = {'results.eln.lab_ids': self.location}
-        search_result = search(
-            owner='all',
-            query=query,
-            pagination=MetadataPagination(page_size=1),
-            user_id=archive.metadata.main_author.user_id,
-        )
-        if search_result.pagination.total > 0:
-            entry_id = search_result.data[0]['entry_id']
-            upload_id = search_result.data[0]['upload_id']
+        total, data = result
+        if total > 0:
+            entry_id = data[0]['entry_id']
+            upload_id = data[0]['upload_id']
             self.plugin = f'../uploads/{upload_id}/archive/{entry_id}#data'
-            if search_result.pagination.total > 1:
+            if total > 1:
                 logger.warn(
-                    f'Found {search_result.pagination.total} entries with repository: '
+                    f'Found {total} entries with repository: '
                     f'"{self.location}". Will use the first one found.'
                 )
         else:
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+import zipfile
+from datetime import datetime, timezone
+
+import click
+
+from nomad_plugins import plugin_crawler
+
+MANIFEST_FILE = 'shard.manifest.json'
+ARCHIVE_SUFFIX = '.archive.json'
+# Fixed timestamp of the files in the merged zip, so equal inputs give equal bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class ShardMergeError(Exception):
+    """
+    Raised if the shards to merge are inconsistent or incomplete.
+    """
+
+    def __init__(self, problems: list[str]) -> None:
+        super().__init__('\n'.join(problems))
+        self.problems = problems
+
+
+def shard_of(key: str, shard_count: int) -> int:
+    """
+    Assigns a plugin repository to a shard. The assignment only depends on the key,
+    so every node agrees on it without coordination.
+    Args:
+        key (str): The key of the plugin, i.e. the repository full name with the
+                   slash replaced by an underscore.
+        shard_count (int): The number of shards.
+    Returns:
+        int: The index of the shard in [0, `shard_count`).
+    """
+
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def search_digest(keys: set[str]) -> str:
+    return hashlib.sha256('\n'.join(sorted(keys)).encode('utf-8')).hexdigest()
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def crawl_shard(token: str, shard_index: int, shard_count: int, save_path: str) -> dict:
+    """
+    Crawls the plugins of one shard and saves their archives together with a shard
+    manifest.
+
+    Every node sweeps the complete code search, which is a few requests per page,
+    but only crawls the repositories of its own shard. The manifest records which
+    repositories the node saw, whether it saw all search results, which ones it was
+    responsible for and which ones it could not crawl because GitHub was
+    unavailable, so the merge can check that the shards fit together.
+    Args:
+        token (str): The GitHub token of this node.
+        shard_index (int): The index of the shard to crawl.
+        shard_count (int): The total number of shards.
+        save_path (str): The directory to save the archives and the manifest in.
+    Returns:
+        dict: The manifest.
+    """
+
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f'Shard index {shard_index} is not in [0, {shard_count})')
+    searched = set()
+    assigned = set()
+
+    def select(key: str) -> bool:
+        searched.add(key)
+        if shard_of(key, shard_count) != shard_index:
+            return False
+        assigned.add(key)
+        return True
+
+    started = now_iso()
+    missing = []
+    search_errors = []
+    plugins = plugin_crawler.find_plugins(
+        token, select=select, missing=missing, search_errors=search_errors
+    )
+    os.makedirs(save_path, exist_ok=True)
+    for key, plugin in plugins.items():
+        save_file = os.path.join(save_path, f'{key}{ARCHIVE_SUFFIX}')
+        with open(save_file, 'w', encoding='utf-8') as f:
+            f.write(plugin_crawler.dumps_archive(plugin))
+    manifest = dict(
+        shard_index=shard_index,
+        shard_count=shard_count,
+        started=started,
+        finished=now_iso(),
+        searched=len(searched),
+        search_digest=search_digest(searched),
+        assigned=sorted(assigned),
+        crawled=sorted(plugins),
+        missing=sorted(missing),
+        search_errors=search_errors,
+    )
+    with open(os.path.join(save_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(shard_path: str) -> dict:
+    """
+    Reads the manifest of a shard.
+    Args:
+        shard_path (str): The directory written by `crawl_shard`.
+    Returns:
+        dict: The manifest, or None if the directory has none.
+    """
+
+    try:
+        with open(os.path.join(shard_path, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def check_shards(manifests: dict[str, dict]) -> list[str]:
+    """
+    Checks that a set of shard manifests covers every shard exactly once and that
+    all nodes saw the same search results.
+    Args:
+        manifests (dict[str, dict]): The manifests by shard directory.
+    Returns:
+        list[str]: The problems found, empty if the shards are complete.
+    """
+
+    problems = []
+    shard_counts = {m['shard_count'] for m in manifests.values()}
+    if len(shard_counts) > 1:
+        problems.append(f'The shards disagree on the shard count: {shard_counts}')
+    shard_count = max(shard_counts)
+    by_index = {}
+    for path, manifest in manifests.items():
+        by_index.setdefault(manifest['shard_index'], []).append(path)
+        misplaced = [
+            key
+            for key in manifest['assigned']
+            if shard_of(key, manifest['shard_count']) != manifest['shard_index']
+        ]
+        if misplaced:
+            problems.append(
+                f'{path} crawled {len(misplaced)} plugins of other shards, '
+                f'e.g. {misplaced[0]}'
+            )
+        if manifest.get('search_errors'):
+            problems.append(
+                f'{path} saw incomplete search results: {manifest["search_errors"][0]}'
+            )
+        if manifest.get('missing'):
+            problems.append(
+                f'{path} could not crawl {len(manifest["missing"])} repositories, '
+                f'e.g. {manifest["missing"][0]}'
+            )
+        missing = {
+            key
+            for key in manifest['crawled']
+            if not os.path.exists(os.path.join(path, f'{key}{ARCHIVE_SUFFIX}'))
+        }
+        if missing:
+            problems.append(
+                f'{path} is missing the archives of {len(missing)} plugins, '
+                f'e.g. {min(missing)}'
+            )
+    for index in range(shard_count):
+        paths = by_index.get(index, [])
+        if not paths:
+            problems.append(f'Shard {index} of {shard_count} is missing')
+        elif len(paths) > 1:
+            problems.append(f'Shard {index} is given more than once: {paths}')
+    digests = {m['search_digest'] for m in manifests.values()}
+    if len(digests) > 1:
+        searched = sorted({m['searched'] for m in manifests.values()})
+        problems.append(
+            'The shards saw different search results '
+            f'({", ".join(map(str, searched))} repositories), crawl them again'
+        )
+    return problems
+
+
+def write_zip(save_path: str, names: list[str]) -> str:
+    """
+    Zips the archives like `shutil.make_archive` does, but with the files in sorted
+    order and with fixed timestamps, so the zip only depends on their content.
+    Args:
+        save_path (str): The directory containing the archives.
+        names (list[str]): The file names of the archives.
+    Returns:
+        str: The path of the zip file.
+    """
+
+    zip_path = f'{save_path}.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        for name in sorted(names):
+            info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            with open(os.path.join(save_path, name), 'rb') as f:
+                zf.writestr(info, f.read())
+    return zip_path
+
+
+def merge_shards(
+    shard_paths: list[str], save_path: str, *, allow_incomplete: bool = False
+) -> dict:
+    """
+    Merges the archives of several shards into the directory and zip archive that
+    `crawl` would have written.
+
+    A plugin found in more than one shard directory is taken from the shard it is
+    assigned to, and otherwise from the most recently finished shard, so the result
+    does not depend on the order of `shard_paths`.
+    Args:
+        shard_paths (list[str]): The directories written by `crawl_shard`.
+        save_path (str): The directory to write the merged archives to. The zip
+                         archive is written next to it.
+        allow_incomplete (bool): If True, problems found by `check_shards` are
+                                 reported instead of raised.
+    Returns:
+        dict: A summary of the merge with the number of plugins, duplicates and
+              skipped repositories, the problems and the path of the zip archive.
+    Raises:
+        ShardMergeError: If a manifest is missing or the shards are inconsistent
+                         and `allow_incomplete` is False.
+    """
+
+    manifests = {}
+    problems = []
+    for path in shard_paths:
+        manifest = read_manifest(path)
+        if manifest is None:
+            problems.append(f'{path} has no {MANIFEST_FILE}')
+        else:
+            manifests[path] = manifest
+    if manifests:
+        problems.extend(check_shards(manifests))
+    else:
+        problems.append('No shard manifests found')
+    if problems and not allow_incomplete:
+        raise ShardMergeError(problems)
+    for problem in problems:
+        click.echo(f'Warning: {problem}')
+
+    candidates = {}
+    for path, manifest in manifests.items():
+        for key in manifest['crawled']:
+            source = os.path.join(path, f'{key}{ARCHIVE_SUFFIX}')
+            if not os.path.exists(source):
+                continue
+            rank = (
+                shard_of(key, manifest['shard_count']) == manifest['shard_index'],
+                manifest['finished'],
+                path,
+            )
+            candidates.setdefault(key, []).append((rank, source))
+
+    os.makedirs(save_path, exist_ok=True)
+    names = []
+    for key, sources in sorted(candidates.items()):
+        _, source = max(sources)
+        name = f'{key}{ARCHIVE_SUFFIX}'
+        with open(source, 'rb') as f:
+            content = f.read()
+        with open(os.path.join(save_path, name), 'wb') as f:
+            f.write(content)
+        names.append(name)
+
+    assigned = set().union(*(m['assigned'] for m in manifests.values()))
+    return dict(
+        shards=len(manifests),
+        plugins=len(names),
+        duplicates=sum(len(s) - 1 for s in candidates.values()),
+        skipped=len(assigned - set(candidates)),
+        problems=problems,
+        zip_path=write_zip(save_path, names),
+    )
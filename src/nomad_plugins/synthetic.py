@@ -0,0 +1,189 @@
+import itertools
+import random
+from datetime import datetime, timedelta, timezone
+
+from nomad_plugins.records import (
+    ENTRY_POINT_TYPES,
+    PluginEntryPointRecord,
+    PluginRecord,
+    PluginReferenceRecord,
+    PyprojectAuthorRecord,
+)
+
+# Rough shares of the entry point types found on GitHub, None is unrecognized
+ENTRY_POINT_WEIGHTS = {
+    'Schema package': 45,
+    'Parser': 20,
+    'App': 12,
+    'Example upload': 10,
+    'Normalizer': 8,
+    'API': 2,
+    None: 3,
+}
+ENTRY_POINT_KEYWORDS = dict(
+    zip(
+        ENTRY_POINT_TYPES,
+        ('schema', 'parser', 'normalizer', 'app', 'example', 'api'),
+    )
+)
+GITHUB_TIMESTAMP = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def power_law(rng: random.Random, alpha: float, maximum: int) -> int:
+    """
+    Draws an integer from a discrete power-law distribution starting at 0 and
+    truncated at `maximum`.
+    Args:
+        rng (random.Random): The random number generator.
+        alpha (float): The shape parameter of the Pareto distribution.
+        maximum (int): The largest value to return.
+    Returns:
+        int: The drawn integer.
+    """
+
+    while True:
+        value = int(rng.paretovariate(alpha)) - 1
+        if value <= maximum:
+            return value
+
+
+def generate_plugins(  # noqa: PLR0913
+    count: int,
+    *,
+    seed: int = 0,
+    owners: int = None,
+    external_dependency_share: float = 0.1,
+    pypi_share: float = 0.6,
+    now: datetime = None,
+) -> dict[str, PluginRecord]:
+    """
+    Generates a realistic synthetic catalog of plugins.
+
+    Stars, the number of plugins per owner and the numbers of entry points and
+    dependencies follow power laws. Dependencies are
+    drawn by preferential attachment among the previously generated plugins, so a
+    few base plugins collect most of the dependents, as `nomad-lab` and the
+    FAIRmat base sections do. A share of the dependencies points to locations that
+    are not in the catalog.
+    Args:
+        count (int): The number of plugins to generate.
+        seed (int): The seed of the random number generator.
+        owners (int): The number of distinct owners. Defaults to a fifth of `count`.
+        external_dependency_share (float): The share of dependencies that are not
+            part of the catalog.
+        pypi_share (float): The share of plugins that are published on PyPI.
+        now (datetime): The time of the synthetic crawl. Defaults to the current
+            time.
+    Returns:
+        dict[str, PluginRecord]: The plugins keyed like the results of
+            `find_plugins`.
+    """
+
+    rng = random.Random(seed)
+    owners = owners or max(count // 5, 1)
+    now = now or datetime.now(timezone.utc)
+    owner_weights = list(itertools.accumulate(1 / (r + 1) for r in range(owners)))
+    types = list(ENTRY_POINT_WEIGHTS)
+    type_weights = list(ENTRY_POINT_WEIGHTS.values())
+    # Every plugin appears once plus once per dependent, so drawing uniformly from
+    # this list picks a plugin with a probability proportional to its fan-in + 1
+    attachment = []
+    locations = []
+    plugins = {}
+    for i in range(count):
+        owner = f'owner-{rng.choices(range(owners), cum_weights=owner_weights)[0]}'
+        name = f'nomad-synthetic-{i}'
+        repository = f'https://github.com/{owner}/{name}'
+        on_pypi = rng.random() < pypi_share
+        created = now - timedelta(days=rng.uniform(0, 3 * 365))
+        last_updated = min(
+            created + timedelta(days=rng.expovariate(1 / 60)),
+            now,
+        )
+        module = name.replace('-', '_')
+        entry_points = []
+        for e, type in enumerate(
+            rng.choices(types, type_weights, k=1 + power_law(rng, 1.5, 15))
+        ):
+            keyword = ENTRY_POINT_KEYWORDS.get(type, 'plugin')
+            entry_point_name = f'{keyword}_entry_point_{e}'
+            entry_points.append(
+                PluginEntryPointRecord(
+                    name=entry_point_name,
+                    module=f'{module}:{entry_point_name}',
+                    type=type,
+                )
+            )
+        dependencies = []
+        for _ in range(power_law(rng, 1.5, 10) if attachment else 0):
+            if rng.random() < external_dependency_share:
+                dependency = f'external-{rng.randrange(count)}'
+                location = f'https://pypi.org/project/{dependency}/'
+            else:
+                target = rng.choice(attachment)
+                dependency, location = locations[target]
+                if any(d.location == location for d in dependencies):
+                    continue
+                attachment.append(target)
+            dependencies.append(
+                PluginReferenceRecord(
+                    name=dependency, location=location, toml_directory=''
+                )
+            )
+        plugins[f'{owner}_{name}'] = PluginRecord(
+            repository=repository,
+            stars=power_law(rng, 1.2, 10000),
+            created=created.strftime(GITHUB_TIMESTAMP),
+            last_updated=last_updated.strftime(GITHUB_TIMESTAMP),
+            owner=owner,
+            name=name,
+            description=f'A synthetic NOMAD plugin number {i}.',
+            authors=[
+                PyprojectAuthorRecord(name=f'Author {a}', email=f'a{a}@example.com')
+                for a in rng.sample(range(count * 2), 1 + power_law(rng, 2, 5))
+            ],
+            maintainers=[],
+            plugin_dependencies=dependencies,
+            on_central=on_pypi and rng.random() < 0.25,  # noqa: PLR2004
+            on_example_oasis=on_pypi and rng.random() < 0.15,  # noqa: PLR2004
+            on_pypi=on_pypi,
+            plugin_entry_points=entry_points,
+            toml_directory='',
+        )
+        locations.append(
+            (name, f'https://pypi.org/project/{name}/' if on_pypi else repository)
+        )
+        attachment.append(i)
+    return plugins
+
+
+def lab_ids(plugin: PluginRecord) -> list[str]:
+    """
+    Gets the lab IDs `Plugin.normalize` assigns to a plugin.
+    Args:
+        plugin (PluginRecord): The plugin.
+    Returns:
+        list[str]: The lab IDs.
+    """
+
+    ids = [plugin.repository]
+    if plugin.on_pypi:
+        ids.append(f'https://pypi.org/project/{plugin.name}/')
+    return ids
+
+
+def fan_in(plugins: dict[str, PluginRecord]) -> dict[str, int]:
+    """
+    Counts the number of dependents of each dependency location.
+    Args:
+        plugins (dict[str, PluginRecord]): The plugins.
+    Returns:
+        dict[str, int]: The number of dependents by location.
+    """
+
+    counts = {}
+    for dependency in itertools.chain.from_iterable(
+        p.plugin_dependencies or [] for p in plugins.values()
+    ):
+        counts[dependency.location] = counts.get(dependency.location, 0) + 1
+    return counts
@@ -15,3 +15,17 @@ def test_schema_package():
     assert entry_archive.metadata.comment == (
         'A plugin for NOMAD containing base sections for material processing.'
     )
+
+
+def test_aggregate_quantities():
+    test_file = os.path.join('tests', 'data', 'test.archive.yaml')
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+
+    plugin = entry_archive.data
+    assert plugin.n_plugin_dependencies == 1
+    assert plugin.n_plugin_entry_points == 3  # noqa: PLR2004
+    assert plugin.plugin_entry_point_types == 'App, Schema package'
+    assert plugin.activity == 'Inactive'
+    assert plugin.total_import_time.to('s').magnitude == 0.75  # noqa: PLR2004
+    assert plugin.max_import_rss_delta.to('byte').magnitude == 3000  # noqa: PLR2004
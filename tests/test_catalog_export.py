@@ -0,0 +1,73 @@
+import pytest
+
+from nomad_plugins.plugin_crawler import save_plugins
+from nomad_plugins.records import (
+    PluginEntryPointRecord,
+    PluginRecord,
+    PluginReferenceRecord,
+    PyprojectAuthorRecord,
+)
+
+pytest.importorskip('pyarrow')
+
+from nomad_plugins.catalog_export import (  # noqa: E402
+    CatalogWriter,
+    export_archives,
+    read_catalog,
+)
+
+
+def make_plugin(i: int) -> PluginRecord:
+    return PluginRecord(
+        repository=f'https://github.com/owner/plugin-{i}',
+        stars=i,
+        last_updated='2024-10-01T12:00:00Z',
+        name=f'plugin-{i}',
+        on_pypi=bool(i % 2),
+        authors=[PyprojectAuthorRecord(name=f'Author {i}')],
+        plugin_entry_points=[
+            PluginEntryPointRecord(name='parser', module='p:parser', type='Parser')
+        ],
+        plugin_dependencies=[
+            PluginReferenceRecord(name=f'plugin-{j}', location=f'loc-{j}')
+            for j in range(i)
+        ],
+    )
+
+
+@pytest.mark.parametrize('format', ['arrow', 'parquet'])
+def test_catalog_roundtrip(tmp_path, format):
+    with CatalogWriter(str(tmp_path), format, batch_size=2) as writer:
+        for i in range(5):
+            writer.write(f'owner_plugin-{i}', make_plugin(i))
+
+    plugins, dependencies = read_catalog(str(tmp_path))
+    assert plugins.num_rows == 5  # noqa: PLR2004
+    assert plugins.column('stars').to_pylist() == [0, 1, 2, 3, 4]
+    row = plugins.slice(3, 1).to_pylist()[0]
+    assert row['authors'] == [{'name': 'Author 3', 'email': None}]
+    assert row['plugin_entry_points'][0]['type'] == 'Parser'
+    assert len(row['plugin_dependencies']) == 3  # noqa: PLR2004
+    assert row['last_updated'].isoformat() == '2024-10-01T12:00:00+00:00'
+    assert dependencies.num_rows == 0 + 1 + 2 + 3 + 4
+    assert dependencies.slice(0, 1).to_pylist()[0] == dict(
+        plugin='owner_plugin-1',
+        plugin_name='plugin-1',
+        dependency_name='plugin-0',
+        dependency_location='loc-0',
+    )
+
+
+def test_export_archives(tmp_path):
+    archive_path = tmp_path / 'archives'
+    archive_path.mkdir()
+    save_plugins({f'owner_plugin-{i}': make_plugin(i) for i in range(3)}, archive_path)
+
+    assert export_archives(str(archive_path), str(tmp_path / 'catalog')) == 3  # noqa: PLR2004
+    plugins, dependencies = read_catalog(str(tmp_path / 'catalog'))
+    assert plugins.column('key').to_pylist() == [
+        'owner_plugin-0',
+        'owner_plugin-1',
+        'owner_plugin-2',
+    ]
+    assert dependencies.num_rows == 3  # noqa: PLR2004
@@ -0,0 +1,221 @@
+import pytest
+import requests
+
+from nomad_plugins import circuit_breaker, plugin_crawler
+from nomad_plugins.circuit_breaker import (
+    HOST_POLICIES,
+    CircuitBreaker,
+    HostPolicy,
+    HostUnavailable,
+)
+from nomad_plugins.records import PluginRecord
+
+COOL_DOWN = 60
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeResponse:
+    def __init__(
+        self, status_code: int, payload: dict = None, headers: dict = None
+    ) -> None:
+        self.status_code = status_code
+        self.ok = status_code < 400  # noqa: PLR2004
+        self.text = ''
+        self.payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self) -> dict:
+        return self.payload
+
+
+def test_breaker_opens_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, cool_down=COOL_DOWN, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = COOL_DOWN
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 2 * COOL_DOWN
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+    assert breaker.failures == 0
+
+
+@pytest.fixture
+def flaky_host(monkeypatch):
+    calls = []
+    responses = {}
+
+    def get(url, **kwargs):
+        calls.append(url)
+        if url not in responses:
+            raise requests.ConnectionError('connection refused')
+        return responses[url]
+
+    monkeypatch.setattr(circuit_breaker.requests, 'get', get)
+    monkeypatch.setitem(
+        HOST_POLICIES,
+        'pypi.org',
+        HostPolicy(retries=2, backoff=0, failure_threshold=1, cool_down=COOL_DOWN),
+    )
+    return calls, responses
+
+
+def test_get_retries_then_skips_open_host(flaky_host):
+    calls, _ = flaky_host
+    url = 'https://pypi.org/pypi/nomad-example/json'
+    with pytest.raises(HostUnavailable):
+        circuit_breaker.get(url)
+    assert len(calls) == 3  # noqa: PLR2004
+
+    with pytest.raises(HostUnavailable):
+        circuit_breaker.get(url)
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+def test_rate_limit_opens_circuit_until_reset(flaky_host, monkeypatch):
+    calls, responses = flaky_host
+    sleeps = []
+    monkeypatch.setattr(circuit_breaker.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(circuit_breaker.time, 'time', lambda: 1000.0)
+    url = 'https://pypi.org/pypi/nomad-example/json'
+    breaker = HOST_POLICIES['pypi.org'].breaker
+
+    # A short wait is slept through and the request retried
+    responses[url] = FakeResponse(429, headers={'Retry-After': '5'})
+    with pytest.raises(HostUnavailable):
+        circuit_breaker.get(url)
+    assert sleeps[0] == 5  # noqa: PLR2004
+    assert breaker.remaining_cool_down() == pytest.approx(5, abs=1)
+
+    # A long wait until the reset opens the circuit without retrying
+    breaker.record_success()
+    calls.clear()
+    responses[url] = FakeResponse(
+        403, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '4600'}
+    )
+    with pytest.raises(HostUnavailable):
+        circuit_breaker.get(url)
+    assert len(calls) == 1
+    assert breaker.remaining_cool_down() == pytest.approx(3600, abs=1)
+
+    # A 403 that is not about the rate limit is returned to the caller
+    breaker.record_success()
+    responses[url] = FakeResponse(403)
+    assert circuit_breaker.get(url).status_code == 403  # noqa: PLR2004
+
+
+def test_unknown_fields_are_filled_later(flaky_host):
+    _, responses = flaky_host
+    plugin = PluginRecord(
+        name='nomad-example',
+        on_pypi=plugin_crawler.is_on_pypi('nomad-example'),
+        unknown_fields=['on_pypi'],
+    )
+    assert plugin.on_pypi is None
+    assert 'on_pypi' not in plugin.to_archive()
+    # Fields that are None for other reasons, e.g. no commits, are not unknown
+    assert plugin_crawler.count_unknown({'example': PluginRecord(name='a')}) == 0
+
+    HOST_POLICIES['pypi.org'].breaker.record_success()
+    responses['https://pypi.org/pypi/nomad-example/json'] = FakeResponse(200)
+    assert plugin_crawler.fill_unknown({'example': plugin}, headers={}) == 0
+    assert plugin.on_pypi is True
+    assert plugin.unknown_fields is None
+
+
+def test_skipped_repositories_are_retried(monkeypatch):
+    items = [{'repository': {'full_name': f'owner/{n}'}} for n in ('a', 'b', 'c')]
+    failures = {'owner/b': 1, 'owner/c': 2}
+
+    def iter_search_pages(headers):
+        yield {'total_count': len(items), 'items': items}
+
+    def get_plugin(item, headers, repo_details=None):
+        name = item['repository']['full_name']
+        if failures.get(name):
+            failures[name] -= 1
+            raise HostUnavailable('api.github.com is unavailable')
+        return PluginRecord(name=name)
+
+    monkeypatch.setattr(plugin_crawler, 'iter_search_pages', iter_search_pages)
+    monkeypatch.setattr(plugin_crawler, 'get_plugin', get_plugin)
+    monkeypatch.setattr(plugin_crawler, 'fill_unknown', lambda plugins, headers: 0)
+    monkeypatch.setattr(circuit_breaker, 'wait_for_recovery', lambda: 0.0)
+
+    missing = []
+    plugins = plugin_crawler.find_plugins('token', missing=missing)
+    assert set(plugins) == {'owner_a', 'owner_b'}
+    assert missing == ['owner_c']
+
+
+def test_on_plugin_sees_filled_fields(monkeypatch):
+    items = [{'repository': {'full_name': f'owner/{n}'}} for n in ('a', 'b')]
+    events = []
+
+    def iter_search_pages(headers):
+        yield {'total_count': len(items), 'items': items}
+
+    def get_plugin(item, headers):
+        name = item['repository']['full_name']
+        if name == 'owner/a':
+            return PluginRecord(name=name, on_pypi=False)
+        return PluginRecord(name=name, unknown_fields=['on_pypi'])
+
+    def fill_unknown(plugins, headers):
+        events.append('fill')
+        for plugin in plugins.values():
+            plugin.on_pypi = True
+            plugin.unknown_fields = None
+        return 0
+
+    monkeypatch.setattr(plugin_crawler, 'iter_search_pages', iter_search_pages)
+    monkeypatch.setattr(plugin_crawler, 'get_plugin', get_plugin)
+    monkeypatch.setattr(plugin_crawler, 'fill_unknown', fill_unknown)
+    monkeypatch.setattr(circuit_breaker, 'wait_for_recovery', lambda: 0.0)
+
+    plugin_crawler.find_plugins(
+        'token', on_plugin=lambda name, plugin: events.append((name, plugin.on_pypi))
+    )
+    # Complete plugins are passed on right away, the others after the fill pass
+    assert events == [('owner_a', False), 'fill', ('owner_b', True)]
+
+
+def test_truncated_search_is_reported(monkeypatch):
+    items = [{'repository': {'full_name': 'owner/a'}}]
+    first_page = FakeResponse(200, {'total_count': 2, 'items': items})
+    first_page.links = {'next': {'url': 'page-2'}}
+
+    def get(url, params=None, **kwargs):
+        if params['page'] == 1:
+            return first_page
+        raise HostUnavailable('api.github.com is unavailable')
+
+    monkeypatch.setattr(circuit_breaker, 'get', get)
+    monkeypatch.setattr(
+        plugin_crawler,
+        'get_plugin',
+        lambda item, headers: PluginRecord(name=item['repository']['full_name']),
+    )
+
+    missing, search_errors = [], []
+    plugins = plugin_crawler.find_plugins(
+        'token', missing=missing, search_errors=search_errors
+    )
+    assert set(plugins) == {'owner_a'}
+    assert missing == []
+    assert search_errors == ['Failed to fetch page 2: api.github.com is unavailable']
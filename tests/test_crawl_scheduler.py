@@ -0,0 +1,246 @@
+from datetime import datetime, timezone
+
+from nomad_plugins import plugin_crawler
+from nomad_plugins.crawl_scheduler import CrawlScheduler
+from nomad_plugins.records import PluginRecord
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+START = datetime(2024, 10, 1, tzinfo=timezone.utc).timestamp()
+
+
+class SimulatedClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        '%Y-%m-%dT%H:%M:%SZ'
+    )
+
+
+def test_scheduler_prioritizes_active_repositories(monkeypatch):
+    clock = SimulatedClock(START)
+    push_period = {'owner/hot': 2 * HOUR, 'owner/cold': None}
+    checks = {name: 0 for name in push_period}
+
+    def last_push(name: str) -> float:
+        period = push_period[name]
+        if period is None:
+            return START - 300 * DAY
+        return START + ((clock.now - START) // period) * period
+
+    def iter_search_pages(headers):
+        yield {'items': [{'repository': {'full_name': n}} for n in push_period]}
+
+    def fetch_repo_details_conditional(name, headers, etag=None):
+        checks[name] += 1
+        current = iso(last_push(name))
+        if etag == current:
+            return 304, None, etag
+        return 200, {'pushed_at': current}, current
+
+    def get_plugin(item, headers, repo_details=None):
+        return PluginRecord(
+            name=item['repository']['full_name'],
+            last_updated=repo_details['pushed_at'],
+        )
+
+    monkeypatch.setattr(plugin_crawler, 'iter_search_pages', iter_search_pages)
+    monkeypatch.setattr(
+        plugin_crawler,
+        'fetch_repo_details_conditional',
+        fetch_repo_details_conditional,
+    )
+    monkeypatch.setattr(plugin_crawler, 'get_plugin', get_plugin)
+    monkeypatch.setattr(plugin_crawler, 'fill_unknown', lambda plugins, headers: 0)
+
+    batches = []
+
+    def emit(plugins):
+        batches.append(dict(plugins))
+        return True
+
+    scheduler = CrawlScheduler(
+        headers={},
+        emit=emit,
+        clock=clock,
+        min_interval=600,
+        max_interval=7 * DAY,
+        discovery_interval=DAY,
+        emit_interval=900,
+        report_interval=10 * DAY,
+    )
+    scheduler.run(until=START + 2 * DAY)
+
+    assert set(batches[0]) == {'owner_hot', 'owner_cold'}
+    assert all(set(batch) == {'owner_hot'} for batch in batches[1:])
+    assert checks['owner/hot'] > 10 * checks['owner/cold']  # noqa: PLR2004
+
+    stats = scheduler.stats()
+    assert stats['repositories'] == 2  # noqa: PLR2004
+    assert stats['search_pages'] == 2  # noqa: PLR2004
+    assert stats['updates'] > 0
+    assert stats['not_modified'] > 0
+    assert stats['max_latency_s'] <= 2 * HOUR
+
+
+def test_scheduler_retries_failed_crawls(monkeypatch):
+    clock = SimulatedClock(START)
+    pushed_at = iso(START - DAY)
+    attempts = []
+
+    def iter_search_pages(headers):
+        yield {'items': [{'repository': {'full_name': 'owner/flaky'}}]}
+
+    def fetch_repo_details_conditional(name, headers, etag=None):
+        if etag == pushed_at:
+            return 304, None, etag
+        return 200, {'pushed_at': pushed_at}, pushed_at
+
+    def get_plugin(item, headers, repo_details=None):
+        attempts.append(clock.now)
+        if len(attempts) < 3:  # noqa: PLR2004
+            return None
+        return PluginRecord(name='flaky', last_updated=repo_details['pushed_at'])
+
+    monkeypatch.setattr(plugin_crawler, 'iter_search_pages', iter_search_pages)
+    monkeypatch.setattr(
+        plugin_crawler,
+        'fetch_repo_details_conditional',
+        fetch_repo_details_conditional,
+    )
+    monkeypatch.setattr(plugin_crawler, 'get_plugin', get_plugin)
+    monkeypatch.setattr(plugin_crawler, 'fill_unknown', lambda plugins, headers: 0)
+
+    batches = []
+
+    def emit(plugins):
+        batches.append(dict(plugins))
+        return True
+
+    scheduler = CrawlScheduler(
+        headers={},
+        emit=emit,
+        clock=clock,
+        min_interval=600,
+        discovery_interval=DAY,
+        emit_interval=900,
+        report_interval=10 * DAY,
+    )
+    scheduler.run(until=START + HOUR)
+
+    assert [a - START for a in attempts] == [0, 600, 1800]
+    assert batches == [{'owner_flaky': batches[0]['owner_flaky']}]
+
+
+def test_scheduler_reemits_plugins_changing_activity(monkeypatch):
+    clock = SimulatedClock(START)
+    pushed_at = iso(START - 89 * DAY)
+
+    def iter_search_pages(headers):
+        yield {'items': [{'repository': {'full_name': 'owner/dormant'}}]}
+
+    def fetch_repo_details_conditional(name, headers, etag=None):
+        if etag == pushed_at:
+            return 304, None, etag
+        return 200, {'pushed_at': pushed_at}, pushed_at
+
+    def get_plugin(item, headers, repo_details=None):
+        return PluginRecord(name='dormant', last_updated=pushed_at)
+
+    monkeypatch.setattr(plugin_crawler, 'iter_search_pages', iter_search_pages)
+    monkeypatch.setattr(
+        plugin_crawler,
+        'fetch_repo_details_conditional',
+        fetch_repo_details_conditional,
+    )
+    monkeypatch.setattr(plugin_crawler, 'get_plugin', get_plugin)
+    monkeypatch.setattr(plugin_crawler, 'fill_unknown', lambda plugins, headers: 0)
+
+    batches = []
+
+    def emit(plugins):
+        batches.append(clock.now)
+        return True
+
+    scheduler = CrawlScheduler(
+        headers={},
+        emit=emit,
+        clock=clock,
+        discovery_interval=10 * DAY,
+        emit_interval=900,
+        report_interval=10 * DAY,
+    )
+    scheduler.run(until=START + 5 * DAY)
+
+    # Emitted when discovered and again once it is no longer 'Active'
+    assert len(batches) == 2  # noqa: PLR2004
+    assert START + 2 * DAY <= batches[1] <= START + 2 * DAY + HOUR
+    assert scheduler.repos['owner_dormant'].activity == 'Maintained'
+
+
+def test_scheduler_keeps_plugins_of_failed_emits(monkeypatch):
+    clock = SimulatedClock(START)
+    first_push = START + 600
+
+    def iter_search_pages(headers):
+        yield {'items': [{'repository': {'full_name': n}} for n in ('a', 'b')]}
+
+    def fetch_repo_details_conditional(name, headers, etag=None):
+        current = iso(
+            START - DAY if name == 'a' or clock.now < first_push else first_push
+        )
+        if etag == current:
+            return 304, None, etag
+        return 200, {'pushed_at': current}, current
+
+    def get_plugin(item, headers, repo_details=None):
+        return PluginRecord(
+            name=item['repository']['full_name'],
+            last_updated=repo_details['pushed_at'],
+        )
+
+    monkeypatch.setattr(plugin_crawler, 'iter_search_pages', iter_search_pages)
+    monkeypatch.setattr(
+        plugin_crawler,
+        'fetch_repo_details_conditional',
+        fetch_repo_details_conditional,
+    )
+    monkeypatch.setattr(plugin_crawler, 'get_plugin', get_plugin)
+    monkeypatch.setattr(plugin_crawler, 'fill_unknown', lambda plugins, headers: 0)
+
+    attempts = []
+
+    def emit(plugins):
+        attempts.append((clock.now, set(plugins)))
+        # NOMAD is down for the first hour
+        return clock.now >= START + HOUR
+
+    scheduler = CrawlScheduler(
+        headers={},
+        emit=emit,
+        clock=clock,
+        min_interval=600,
+        max_interval=1800,
+        discovery_interval=DAY,
+        emit_interval=900,
+        report_interval=10 * DAY,
+    )
+    scheduler.run(until=START + 2 * HOUR)
+
+    failed = [plugins for now, plugins in attempts if now < START + HOUR]
+    succeeded = [(now, plugins) for now, plugins in attempts if now >= START + HOUR]
+    assert failed
+    assert all(plugins == {'a', 'b'} for plugins in failed)
+    # The initial crawl and the push reach NOMAD with the first successful emit
+    assert succeeded[0][1] == {'a', 'b'}
+    assert scheduler.pending == {}
+    assert scheduler.latencies == [succeeded[0][0] - first_push]
@@ -0,0 +1,134 @@
+import importlib.util
+import subprocess
+import sys
+
+import pytest
+
+from nomad_plugins.import_profiler import (
+    PROBE_MARKER,
+    create_environment,
+    parse_importtime,
+    profile_entry_point,
+    profile_plugins,
+)
+from nomad_plugins.records import PluginEntryPointRecord, PluginRecord
+
+ENTRY_POINT_MODULE = """
+import array
+
+
+class EntryPoint:
+    def load(self):
+        self.data = array.array('b', bytes(32 * 1024 * 1024))
+        return self.data
+
+
+entry_point = EntryPoint()
+"""
+
+PYPROJECT = """
+[build-system]
+requires = ["setuptools"]
+build-backend = "setuptools.build_meta"
+
+[project]
+name = "fake-plugin"
+version = "0.1.0"
+
+[tool.setuptools]
+py-modules = ["fake_plugin"]
+"""
+
+
+def test_parse_importtime():
+    stderr = '\n'.join(
+        [
+            'import time: self [us] | cumulative | imported package',
+            'import time:       900 |        900 | json',
+            PROBE_MARKER,
+            'import time:       100 |        100 |   _heavy_c',
+            'import time:      2000 |       2100 | heavy',
+            'import time:        50 |       2150 | my_plugin',
+        ]
+    )
+    breakdown = parse_importtime(stderr, top=2)
+    assert [m.module for m in breakdown] == ['heavy', '_heavy_c']
+    assert breakdown[0].self_time == 2000e-6  # noqa: PLR2004
+    assert breakdown[0].cumulative_time == 2100e-6  # noqa: PLR2004
+
+
+def test_profile_entry_point(tmp_path):
+    (tmp_path / 'fake_plugin.py').write_text(ENTRY_POINT_MODULE)
+
+    metrics = profile_entry_point(
+        sys.executable, 'fake_plugin:entry_point', timeout=60, cwd=tmp_path
+    )
+    assert metrics['import_time'] > 0
+    assert metrics['import_rss_delta'] >= 32 * 1024 * 1024
+    assert 'fake_plugin' in [m.module for m in metrics['import_time_breakdown']]
+
+    assert profile_entry_point(sys.executable, 'missing_plugin:x', cwd=tmp_path) is None
+
+
+def test_profile_plugins(tmp_path):
+    if importlib.util.find_spec('ensurepip') is None:
+        pytest.skip('venv cannot install pip without ensurepip')
+    package = tmp_path / 'package'
+    package.mkdir()
+    (package / 'pyproject.toml').write_text(PYPROJECT)
+    (package / 'fake_plugin.py').write_text(ENTRY_POINT_MODULE)
+    wheelhouse = tmp_path / 'wheelhouse'
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-m',
+            'pip',
+            'wheel',
+            '--quiet',
+            '--no-deps',
+            '--no-build-isolation',
+            '--wheel-dir',
+            str(wheelhouse),
+            str(package),
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        pytest.skip(f'Failed to build the wheel: {result.stderr.strip()}')
+
+    assert (
+        create_environment('missing-plugin', str(wheelhouse), str(tmp_path / 'env'))
+        is None
+    )
+
+    plugin = PluginRecord(
+        name='fake-plugin',
+        plugin_entry_points=[
+            PluginEntryPointRecord(name='loads', module='fake_plugin:entry_point'),
+            # Metrics of an earlier run that no longer hold
+            PluginEntryPointRecord(
+                name='broken',
+                module='fake_plugin:missing',
+                import_time=1.0,
+                import_rss_delta=1,
+                import_time_breakdown=[],
+            ),
+        ],
+    )
+    profiled = profile_plugins(
+        {'owner_fake-plugin': plugin},
+        str(wheelhouse),
+        str(tmp_path / 'work'),
+        workers=1,
+        timeout=60,
+    )
+    assert profiled == 1
+    loads, broken = plugin.plugin_entry_points
+    assert loads.import_rss_delta >= 32 * 1024 * 1024
+    assert 'fake_plugin' in [m.module for m in loads.import_time_breakdown]
+    assert broken.import_time is None
+    assert broken.import_rss_delta is None
+    assert broken.import_time_breakdown is None
+    assert not (tmp_path / 'work' / 'owner_fake-plugin').exists()
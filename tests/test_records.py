@@ -0,0 +1,80 @@
+import json
+
+from nomad.client import normalize_all, parse
+
+from nomad_plugins.plugin_crawler import get_entry_points
+from nomad_plugins.records import (
+    ImportTimeRecord,
+    PluginEntryPointRecord,
+    PluginRecord,
+    PluginReferenceRecord,
+    PyprojectAuthorRecord,
+    dumps_archive,
+)
+
+
+def test_get_entry_points():
+    project = {
+        'entry-points': {
+            'nomad.plugin': {
+                'my_parser': 'my_plugin.parsers:my_parser',
+                'other': 'my_plugin.other:entry_point',
+            }
+        }
+    }
+    assert get_entry_points(project) == [
+        PluginEntryPointRecord(
+            name='my_parser', module='my_plugin.parsers:my_parser', type='Parser'
+        ),
+        PluginEntryPointRecord(
+            name='other', module='my_plugin.other:entry_point', type=None
+        ),
+    ]
+
+
+def test_dumps_archive(tmp_path):
+    plugin = PluginRecord(
+        repository='https://github.com/FAIRmat-NFDI/nomad-material-processing',
+        name='nomad-material-processing',
+        description='A plugin for NOMAD.',
+        on_pypi=True,
+        on_central=None,
+        authors=[PyprojectAuthorRecord.from_toml({'name': 'Hampus Näsström'})],
+        maintainers=[],
+        plugin_entry_points=[
+            PluginEntryPointRecord(
+                name='schema',
+                module='nomad_material_processing:schema',
+                type='App',
+                import_time=0.25,
+                import_time_breakdown=[
+                    ImportTimeRecord(module='numpy', self_time=0.1, cumulative_time=0.2)
+                ],
+            )
+        ],
+        unknown_fields=['on_central'],
+        plugin_dependencies=[
+            PluginReferenceRecord(
+                name='nomad-lab',
+                location='https://pypi.org/project/nomad-lab/',
+                toml_directory='',
+            )
+        ],
+    )
+    assert dumps_archive(plugin) == json.dumps(
+        {'data': plugin.to_archive()}, separators=(',', ':'), ensure_ascii=False
+    )
+    data = json.loads(dumps_archive(plugin))['data']
+    assert 'stars' not in data
+    assert data['m_def'] == 'nomad_plugins.schema_packages.plugin.Plugin'
+    assert 'on_central' not in data
+    assert 'unknown_fields' not in data
+    assert data['authors'] == [{'name': 'Hampus Näsström'}]
+
+    archive_file = tmp_path / 'plugin.archive.json'
+    archive_file.write_text(dumps_archive(plugin), encoding='utf-8')
+    entry_archive = parse(str(archive_file))[0]
+    normalize_all(entry_archive)
+    assert entry_archive.data.plugin_dependencies[0].name == 'nomad-lab'
+    assert entry_archive.data.plugin_entry_points[0].type == 'App'
+    assert entry_archive.metadata.comment == 'A plugin for NOMAD.'
@@ -0,0 +1,221 @@
+import base64
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from nomad_plugins.sharded_crawl import (
+    ShardMergeError,
+    merge_shards,
+    read_manifest,
+    shard_of,
+)
+
+REPOSITORIES = [f'owner-{i % 4}/plugin-{i}' for i in range(45)]
+PER_PAGE = 30
+SHARDS = 3
+HTTP_NOT_FOUND = 404
+DISTRO_TOML = """
+[project.optional-dependencies]
+plugins = ["plugin-0", "plugin-3>=1.0"]
+"""
+
+
+def pyproject(i: int) -> str:
+    dependencies = ['numpy>=1.0'] + ([f'plugin-{i - 1}'] if i else [])
+    return f"""
+[project]
+name = "plugin-{i}"
+description = "Stub plugin {i}"
+authors = [{{ name = "Author {i}", email = "a{i}@example.com" }}]
+dependencies = {json.dumps(dependencies)}
+
+[project.entry-points.'nomad.plugin']
+schema = "plugin_{i}.schema_packages:schema_entry_point"
+"""
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """
+    Serves just enough of the GitHub, PyPI and oasis distribution APIs for a crawl.
+    """
+
+    requests = []
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def reply(self, payload, status: int = 200, links: str = None) -> None:
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        self.send_response(status)
+        if links:
+            self.send_header('Link', links)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def do_GET(self) -> None:  # noqa: PLR0911
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        base = f'http://127.0.0.1:{self.server.server_port}'
+        StubAPI.requests.append((self.headers.get('Authorization'), url.path))
+        if parts[0] == 'search':
+            page = int(parse_qs(url.query)['page'][0])
+            items = [
+                {
+                    'repository': {
+                        'full_name': name,
+                        'url': f'{base}/repos/{name}',
+                        'owner': {'login': name.split('/')[0]},
+                    },
+                    'path': 'pyproject.toml',
+                }
+                for name in REPOSITORIES[(page - 1) * PER_PAGE : page * PER_PAGE]
+            ]
+            links = None
+            if page * PER_PAGE < len(REPOSITORIES):
+                links = f'<{base}/search/code?page={page + 1}>; rel="next"'
+            return self.reply(
+                {'total_count': len(REPOSITORIES), 'items': items}, links=links
+            )
+        if parts[0] == 'repos':
+            i = int(parts[2].split('-')[1])
+            if parts[3:] == ['contents', 'pyproject.toml']:
+                content = base64.b64encode(pyproject(i).encode()).decode()
+                return self.reply({'content': content})
+            if parts[3:] == ['commits']:
+                date = f'2024-01-{i % 28 + 1:02d}T00:00:00Z'
+                return self.reply([{'commit': {'committer': {'date': date}}}])
+            return self.reply(
+                {'stargazers_count': i, 'pushed_at': '2024-06-01T00:00:00Z'}
+            )
+        if parts[0] == 'pypi':
+            if parts[1].startswith('plugin-') and int(parts[1].split('-')[1]) % 2:
+                return self.reply({'info': {'requires_dist': ['nomad-lab>=1.3']}})
+            return self.reply({'message': 'Not Found'}, status=HTTP_NOT_FOUND)
+        if parts[0] == 'distro':
+            return self.reply(DISTRO_TOML)
+        return self.reply({'message': 'Not Found'}, status=HTTP_NOT_FOUND)
+
+
+@pytest.fixture(scope='module')
+def stub_api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def run_shards(base: str, directory: str, shard_count: int) -> list[str]:
+    env = dict(
+        os.environ,
+        NOMAD_PLUGINS_GITHUB_API=base,
+        NOMAD_PLUGINS_PYPI_API=f'{base}/pypi',
+        NOMAD_PLUGINS_DISTRO_URL=f'{base}/distro',
+    )
+    paths = [os.path.join(directory, f'shard-{i}') for i in range(shard_count)]
+    nodes = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                '-m',
+                'nomad_plugins.plugin_crawler',
+                'shard',
+                '--github-token',
+                f'token-{i}',
+                '--shard-index',
+                str(i),
+                '--shard-count',
+                str(shard_count),
+                '--save-path',
+                path,
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for i, path in enumerate(paths)
+    ]
+    for node in nodes:
+        _, stderr = node.communicate(timeout=120)
+        assert node.returncode == 0, stderr
+    return paths
+
+
+def test_sharded_crawl_matches_single_crawl(stub_api, tmp_path):
+    StubAPI.requests.clear()
+    paths = run_shards(stub_api, tmp_path / 'sharded', SHARDS)
+
+    # Every repository is crawled by exactly one node, with the token of its shard
+    details = Counter(
+        (token, path)
+        for token, path in StubAPI.requests
+        if path.startswith('/repos/') and path.count('/') == 3  # noqa: PLR2004
+    )
+    assert len(details) == len(REPOSITORIES)
+    for (token, path), count in details.items():
+        key = path.removeprefix('/repos/').replace('/', '_')
+        assert token == f'token token-{shard_of(key, SHARDS)}'
+        assert count == 1
+
+    manifests = [read_manifest(path) for path in paths]
+    assert sum(len(m['crawled']) for m in manifests) == len(REPOSITORIES)
+    assert len({m['search_digest'] for m in manifests}) == 1
+
+    summary = merge_shards(paths, str(tmp_path / 'merged'))
+    assert summary['plugins'] == len(REPOSITORIES)
+    assert summary['problems'] == []
+
+    with open(tmp_path / 'merged' / 'owner-2_plugin-6.archive.json') as f:
+        data = json.load(f)['data']
+    assert data['on_central'] is False
+    assert [d['name'] for d in data['plugin_dependencies']] == ['plugin-5']
+
+    single = run_shards(stub_api, tmp_path / 'single', 1)
+    single_summary = merge_shards(single, str(tmp_path / 'single-merged'))
+    with (
+        open(summary['zip_path'], 'rb') as a,
+        open(single_summary['zip_path'], 'rb') as b,
+    ):
+        assert a.read() == b.read()
+
+
+def test_merge_checks_completeness(tmp_path):
+    def write_shard(index: int, keys: list[str], digest: str = 'abc') -> str:
+        path = tmp_path / f'shard-{index}'
+        path.mkdir()
+        for key in keys:
+            (path / f'{key}.archive.json').write_text(json.dumps({'data': {}}))
+        manifest = dict(
+            shard_index=index,
+            shard_count=2,
+            finished=f'2024-01-0{index + 1}T00:00:00Z',
+            searched=4,
+            search_digest=digest,
+            assigned=keys,
+            crawled=keys,
+        )
+        (path / 'shard.manifest.json').write_text(json.dumps(manifest))
+        return str(path)
+
+    keys = [f'owner_plugin-{i}' for i in range(4)]
+    first = write_shard(0, [k for k in keys if shard_of(k, 2) == 0])
+    with pytest.raises(ShardMergeError, match='Shard 1 of 2 is missing'):
+        merge_shards([first], str(tmp_path / 'merged'))
+
+    second = write_shard(1, [k for k in keys if shard_of(k, 2) == 1], digest='def')
+    with pytest.raises(ShardMergeError, match='different search results'):
+        merge_shards([first, second], str(tmp_path / 'merged'))
+
+    summary = merge_shards(
+        [second, first], str(tmp_path / 'merged'), allow_incomplete=True
+    )
+    assert summary['plugins'] == len(keys)
+    assert len(summary['problems']) == 1
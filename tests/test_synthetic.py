@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+from nomad.datamodel import EntryArchive
+
+from nomad_plugins.schema_packages import plugin as plugin_schema
+from nomad_plugins.synthetic import fan_in, generate_plugins, lab_ids
+
+
+def test_generate_plugins():
+    now = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    plugins = generate_plugins(500, seed=1, now=now)
+    assert len(plugins) == 500  # noqa: PLR2004
+    assert generate_plugins(500, seed=1, now=now) == plugins
+
+    known = set()
+    for plugin in plugins.values():
+        for dependency in plugin.plugin_dependencies:
+            assert dependency.location in known or 'external' in dependency.location
+        known.update(lab_ids(plugin))
+    assert max(fan_in(plugins).values()) > 10  # noqa: PLR2004
+
+
+def test_synthetic_references_resolve(monkeypatch):
+    plugins = generate_plugins(100, seed=2)
+    index = {lab_id: key for key, p in plugins.items() for lab_id in lab_ids(p)}
+
+    def search_lab_id(archive, lab_id):
+        if lab_id not in index:
+            return 0, []
+        return 1, [{'entry_id': index[lab_id], 'upload_id': 'upload'}]
+
+    monkeypatch.setattr(plugin_schema, 'search_lab_id', search_lab_id)
+
+    resolved = 0
+    for key, plugin in plugins.items():
+        archive = EntryArchive.m_from_dict(
+            {'metadata': {'entry_id': key}, 'data': plugin.to_archive()}
+        )
+        archive.data.normalize(archive, None)
+        assert archive.data.n_plugin_dependencies == len(plugin.plugin_dependencies)
+        for reference in archive.data.plugin_dependencies:
+            if 'external' not in reference.location:
+                reference.normalize(archive, None)
+                assert reference.m_is_set(plugin_schema.PluginReference.plugin)
+                resolved += 1
+    assert resolved > 0